@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterator, List
+
+from sqlalchemy.sql import Select
+
+from ..config import settings
+from ..database import SessionLocal
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        # Applicant-supplied text must not run when an admin opens the file
+        return "'" + value
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_export(statement: Select, fmt: str) -> Iterator[str]:
+    """Yield ``statement``'s rows encoded as CSV or NDJSON, one batch at a time.
+
+    Rows are read through a server-side cursor (``yield_per``) on a session
+    owned by the generator, so memory stays bounded by the batch size no
+    matter how many rows match, and the request's own session is not held
+    while the body streams.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            statement.execution_options(yield_per=settings.export_batch_size)
+        )
+        columns: List[str] = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(columns)
+
+        for partition in result.partitions():
+            for row in partition:
+                if writer is not None:
+                    writer.writerow([_cell(value) for value in row])
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
@@ -0,0 +1,345 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from .. import json_lists
+from ..auth.utils import get_current_admin_user
+from ..clubs.recommend import recommender
+from ..clubs.utils import clubs_cache
+from ..config import settings
+from ..database import get_db
+from ..models import Club, ClubApplication, ClubEvent, ClubMembership, User
+from ..schemas import (
+    ApplicationStatus,
+    BulkDelete,
+    BulkResponse,
+    ClubBulkCreate,
+    ClubBulkUpdate,
+    ClubEventBulkCreate,
+    ClubEventBulkUpdate,
+    MediaGarbageCollectionResponse,
+)
+from ..events.ical import ICS_FIELDS, ical_feeds
+from ..events.live import LIVE_FIELDS, broadcaster, capacity_payload
+from ..geo import geohash_for
+from ..media.storage import collect_garbage
+from ..profiling import list_profiles, profile_path
+from .exports import EXPORT_FORMATS, stream_export
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+
+def _reject(errors: List[Dict[str, Any]]) -> None:
+    """Abort the whole batch with per-item validation errors."""
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors,
+        )
+
+
+def _check_size(items: Sequence[Any]) -> None:
+    if not items:
+        _reject([{"index": None, "error": "Batch is empty"}])
+    if len(items) > settings.bulk_max_items:
+        _reject([{"index": None, "error": f"Batch exceeds {settings.bulk_max_items} items"}])
+
+
+def _check_ids(db: Session, model, ids: List[int]) -> None:
+    """Reject duplicate ids and ids that do not exist, using one query."""
+    errors = []
+    seen = set()
+    for index, item_id in enumerate(ids):
+        if item_id in seen:
+            errors.append({"index": index, "id": item_id, "error": "Duplicate id in batch"})
+        seen.add(item_id)
+    existing = set(db.execute(select(model.id).where(model.id.in_(seen))).scalars())
+    errors.extend(
+        {"index": index, "id": item_id, "error": "Not found"}
+        for index, item_id in enumerate(ids)
+        if item_id not in existing
+    )
+    _reject(errors)
+
+
+def _commit(db: Session) -> None:
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Batch rejected by database constraints: {exc.orig}",
+        )
+
+
+def _with_geohash(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill in ``geohash`` for rows setting coordinates.
+
+    Bulk statements skip the mapper events that normally maintain it, so
+    coordinates must be updated as a pair.
+    """
+    errors = []
+    for index, row in enumerate(rows):
+        has_lat, has_lon = "latitude" in row, "longitude" in row
+        if has_lat != has_lon:
+            errors.append({"index": index, "error": "latitude and longitude must be set together"})
+        elif has_lat:
+            row["geohash"] = geohash_for(row["latitude"], row["longitude"])
+    _reject(errors)
+    return rows
+
+
+def _bulk_create(db: Session, model, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ids = db.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    if model in json_lists.SIDE_TABLES:
+        attr = json_lists.SIDE_TABLES[model][0]
+        json_lists.sync_rows(db.connection(), model, zip(ids, (row.get(attr) for row in rows)))
+    _commit(db)
+    return {
+        "results": [{"index": i, "id": item_id, "status": "created"} for i, item_id in enumerate(ids)],
+        "total": len(ids),
+    }
+
+
+def _bulk_update(db: Session, model, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ids = [row["id"] for row in rows]
+    _check_ids(db, model, ids)
+    changed = [row for row in rows if len(row) > 1]
+    if changed:
+        # ORM bulk UPDATE by primary key: rows sharing the same set of keys
+        # are sent as a single executemany
+        db.execute(update(model), changed)
+    if model in json_lists.SIDE_TABLES:
+        attr = json_lists.SIDE_TABLES[model][0]
+        json_lists.sync_rows(db.connection(), model, [(row["id"], row[attr]) for row in rows if attr in row])
+    _commit(db)
+    return {
+        "results": [
+            {"index": i, "id": row["id"], "status": "updated" if len(row) > 1 else "unchanged"}
+            for i, row in enumerate(rows)
+        ],
+        "total": len(rows),
+    }
+
+
+def _bulk_delete(db: Session, model, ids: List[int]) -> Dict[str, Any]:
+    _check_ids(db, model, ids)
+    if model in json_lists.SIDE_TABLES:
+        json_lists.delete_rows(db.connection(), model, ids)
+    db.execute(delete(model).where(model.id.in_(ids)))
+    _commit(db)
+    return {
+        "results": [{"index": i, "id": item_id, "status": "deleted"} for i, item_id in enumerate(ids)],
+        "total": len(ids),
+    }
+
+
+# Clubs
+@router.post("/clubs/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_clubs(payload: ClubBulkCreate, db: Session = Depends(get_db)) -> Any:
+    """Create a batch of clubs in one transaction."""
+    _check_size(payload.items)
+    result = _bulk_create(db, Club, _with_geohash([item.model_dump() for item in payload.items]))
+    recommender.refresh(db, [item["id"] for item in result["results"]])
+    clubs_cache.invalidate()
+    return result
+
+
+@router.patch("/clubs/bulk", response_model=BulkResponse)
+async def bulk_update_clubs(payload: ClubBulkUpdate, db: Session = Depends(get_db)) -> Any:
+    """Update a batch of clubs in one transaction."""
+    _check_size(payload.items)
+    rows = _with_geohash([item.model_dump(exclude_unset=True) for item in payload.items])
+    result = _bulk_update(db, Club, rows)
+    recommender.refresh(db, [row["id"] for row in rows])
+    clubs_cache.invalidate()
+    feed_clubs = [row["id"] for row in rows if "name" in row or "is_active" in row]
+    if feed_clubs:
+        ical_feeds.invalidate(feed_clubs)
+    return result
+
+
+@router.delete("/clubs/bulk", response_model=BulkResponse)
+async def bulk_delete_clubs(payload: BulkDelete, db: Session = Depends(get_db)) -> Any:
+    """Delete a batch of clubs in one transaction."""
+    _check_size(payload.ids)
+    result = _bulk_delete(db, Club, payload.ids)
+    for club_id in payload.ids:
+        recommender.remove(club_id)
+    clubs_cache.invalidate()
+    ical_feeds.invalidate(payload.ids)
+    return result
+
+
+# Events
+def _event_club_ids(db: Session, event_ids: List[int]) -> Set[int]:
+    """Clubs owning ``event_ids``, read before a bulk write changes them."""
+    if not event_ids:
+        return set()
+    return set(db.execute(
+        select(ClubEvent.club_id).where(ClubEvent.id.in_(event_ids))
+    ).scalars())
+
+
+def _notify_capacity(db: Session, event_ids: List[int]) -> None:
+    """Push committed events to live subscribers; bulk statements skip mapper events."""
+    if not event_ids:
+        return
+    rows = db.execute(
+        select(ClubEvent.id, ClubEvent.club_id, ClubEvent.current_participants,
+               ClubEvent.max_participants, ClubEvent.status)
+        .where(ClubEvent.id.in_(event_ids))
+    )
+    for row in rows:
+        broadcaster.notify(capacity_payload(row))
+
+
+@router.post("/events/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_events(
+    payload: ClubEventBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Create a batch of club events in one transaction."""
+    _check_size(payload.items)
+    club_ids = {item.club_id for item in payload.items}
+    existing = set(db.execute(select(Club.id).where(Club.id.in_(club_ids))).scalars())
+    _reject([
+        {"index": i, "club_id": item.club_id, "error": "Club not found"}
+        for i, item in enumerate(payload.items)
+        if item.club_id not in existing
+    ])
+    rows = _with_geohash([{**item.model_dump(), "created_by": current_user.id} for item in payload.items])
+    result = _bulk_create(db, ClubEvent, rows)
+    ical_feeds.invalidate(club_ids)
+    _notify_capacity(db, [item["id"] for item in result["results"]])
+    return result
+
+
+@router.patch("/events/bulk", response_model=BulkResponse)
+async def bulk_update_events(payload: ClubEventBulkUpdate, db: Session = Depends(get_db)) -> Any:
+    """Update a batch of club events in one transaction."""
+    _check_size(payload.items)
+    rows = _with_geohash([item.model_dump(exclude_unset=True) for item in payload.items])
+    feed_ids = [row["id"] for row in rows if any(field in row for field in ICS_FIELDS)]
+    feed_clubs = _event_club_ids(db, feed_ids) | {row["club_id"] for row in rows if "club_id" in row}
+    result = _bulk_update(db, ClubEvent, rows)
+    if feed_ids:
+        ical_feeds.invalidate(feed_clubs, feed_ids)
+    _notify_capacity(db, [row["id"] for row in rows if any(field in row for field in LIVE_FIELDS)])
+    return result
+
+
+@router.delete("/events/bulk", response_model=BulkResponse)
+async def bulk_delete_events(payload: BulkDelete, db: Session = Depends(get_db)) -> Any:
+    """Delete a batch of club events in one transaction."""
+    _check_size(payload.ids)
+    feed_clubs = _event_club_ids(db, payload.ids)
+    result = _bulk_delete(db, ClubEvent, payload.ids)
+    ical_feeds.invalidate(feed_clubs, payload.ids)
+    return result
+
+
+# Exports
+def _export_response(statement, fmt: str, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d%H%M%S}.{fmt}"
+    return StreamingResponse(
+        stream_export(statement, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/exports/applications")
+async def export_applications(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[ApplicationStatus] = Query(None, alias="status"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> StreamingResponse:
+    """Stream club applications as CSV or NDJSON."""
+    statement = select(*ClubApplication.__table__.columns).order_by(ClubApplication.id)
+    if status_filter is not None:
+        statement = statement.where(ClubApplication.status == status_filter.value)
+    if created_after is not None:
+        statement = statement.where(ClubApplication.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(ClubApplication.created_at < created_before)
+    return _export_response(statement, export_format, "applications")
+
+
+@router.get("/exports/memberships")
+async def export_memberships(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(active|inactive)$"),
+    club_id: Optional[int] = None,
+    joined_after: Optional[datetime] = None,
+    joined_before: Optional[datetime] = None,
+) -> StreamingResponse:
+    """Stream club memberships with member contact details as CSV or NDJSON."""
+    statement = (
+        select(
+            ClubMembership.id,
+            ClubMembership.club_id,
+            Club.name.label("club_name"),
+            ClubMembership.user_id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            ClubMembership.role,
+            ClubMembership.is_active,
+            ClubMembership.joined_at,
+        )
+        .join(Club, Club.id == ClubMembership.club_id)
+        .outerjoin(User, User.id == ClubMembership.user_id)
+        .order_by(ClubMembership.id)
+    )
+    if status_filter is not None:
+        statement = statement.where(ClubMembership.is_active.is_(status_filter == "active"))
+    if club_id is not None:
+        statement = statement.where(ClubMembership.club_id == club_id)
+    if joined_after is not None:
+        statement = statement.where(ClubMembership.joined_at >= joined_after)
+    if joined_before is not None:
+        statement = statement.where(ClubMembership.joined_at < joined_before)
+    return _export_response(statement, export_format, "memberships")
+
+
+# Media
+@router.post("/media/gc", response_model=MediaGarbageCollectionResponse)
+async def collect_media_garbage(db: Session = Depends(get_db)) -> Any:
+    """Delete media blobs no gallery image has referenced for the grace period."""
+    return await run_in_threadpool(collect_garbage, db, settings.media_gc_grace_seconds)
+
+
+# Profiles
+@router.get("/profiles")
+async def list_request_profiles() -> Any:
+    """List saved request profiles, newest first."""
+    profiles = await run_in_threadpool(list_profiles)
+    return {"profiles": profiles, "total": len(profiles)}
+
+
+@router.get("/profiles/{profile_id}.{kind}")
+async def download_request_profile(profile_id: str, kind: str) -> FileResponse:
+    """Download a profile as collapsed stacks (``folded``) or its JSON summary with SQL timings."""
+    path = profile_path(profile_id, kind)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    media_type = "text/plain" if kind == "folded" else "application/json"
+    return FileResponse(path, media_type=media_type, filename=f"{profile_id}.{kind}")
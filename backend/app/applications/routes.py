@@ -0,0 +1,163 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+
+from ..auth.utils import get_current_admin_user
+from ..config import settings
+from ..content.utils import decode_cursor, encode_cursor, keyset_time
+from ..database import get_db
+from ..json_lists import contains_all, parse_values
+from ..models import EPOCH, ClubApplication, User, sort_time
+from ..ratelimit import RateLimit
+from ..schemas import (
+    ApplicationBatchReview,
+    ApplicationBatchReviewResponse,
+    ApplicationStatus,
+    ApplicationStatusCounts,
+    ClubApplicationCreate,
+    ClubApplicationListAdapter,
+    ClubApplicationListResponse,
+    ClubApplicationResponse,
+    dump_list_json,
+)
+from .validation import current_join_form
+
+router = APIRouter(prefix="/applications", tags=["Applications"])
+
+# Applications that still await a decision
+_OPEN_STATUSES = (ApplicationStatus.SUBMITTED.value, ApplicationStatus.UNDER_REVIEW.value)
+
+
+@router.post(
+    "",
+    response_model=ClubApplicationResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("applications", settings.rate_limit_applications))],
+)
+async def submit_application(
+    application_data: ClubApplicationCreate,
+    db: Session = Depends(get_db),
+) -> Any:
+    """Submit a membership application, checked against the join form rules."""
+    validator = await current_join_form()
+    errors = validator.validate(application_data)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors,
+        )
+    application = ClubApplication(**application_data.model_dump())
+    db.add(application)
+    db.commit()
+    db.refresh(application)
+    return application
+
+
+@router.get("", response_model=ClubApplicationListResponse)
+async def list_applications(
+    status_filter: Optional[ApplicationStatus] = Query(None, alias="status"),
+    interests: Optional[str] = Query(None, description="Comma-separated interests, all required"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.applications_page_size, ge=1, le=settings.applications_max_page_size),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """List applications for review, newest first, paginated by keyset cursor."""
+    query = db.query(ClubApplication)
+    if status_filter is not None:
+        query = query.filter(ClubApplication.status == status_filter.value)
+    bind = db.get_bind()
+    created_at = keyset_time(sort_time(ClubApplication.created_at), bind)
+    interest_values = parse_values(interests)
+    if interest_values:
+        query = query.filter(contains_all(ClubApplication, interest_values, bind))
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.filter(
+            tuple_(created_at, ClubApplication.id) < tuple_(keyset_time(position[0], bind), position[1])
+        )
+
+    rows = (
+        query.order_by(created_at.desc(), ClubApplication.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at or EPOCH, rows[-1].id)
+
+    body = dump_list_json(ClubApplicationListAdapter, rows)
+    return Response(
+        content=b'{"applications":%s,"next_cursor":%s}' % (body, json.dumps(next_cursor).encode()),
+        media_type="application/json",
+    )
+
+
+@router.get("/counts", response_model=ApplicationStatusCounts)
+async def count_applications(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Get the number of applications in each status."""
+    counts = {s.value: 0 for s in ApplicationStatus}
+    rows = db.execute(
+        select(ClubApplication.status, func.count()).group_by(ClubApplication.status)
+    )
+    for application_status, count in rows:
+        if application_status in counts:
+            counts[application_status] = count
+    return {"counts": counts, "total": sum(counts.values())}
+
+
+@router.post("/review", response_model=ApplicationBatchReviewResponse)
+async def review_applications(
+    review: ApplicationBatchReview,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Approve or reject many open applications with a single UPDATE.
+
+    Ids that do not exist or were already decided are returned as skipped.
+    """
+    ids = list(dict.fromkeys(review.ids))
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No applications given",
+        )
+    if len(ids) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch exceeds {settings.bulk_max_items} items",
+        )
+
+    values = {
+        "status": review.status.value,
+        "reviewed_by": current_user.id,
+        "reviewed_at": func.now(),
+    }
+    if review.notes is not None:
+        values["notes"] = review.notes
+    updated = db.execute(
+        update(ClubApplication)
+        .where(ClubApplication.id.in_(ids), ClubApplication.status.in_(_OPEN_STATUSES))
+        .values(**values)
+        .returning(ClubApplication.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+    db.commit()
+
+    done = set(updated)
+    return {
+        "updated": [i for i in ids if i in done],
+        "skipped": [i for i in ids if i not in done],
+    }
@@ -0,0 +1,210 @@
+import re
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Pattern
+
+from ..cache import SWRCache
+from ..config import settings
+from ..content.utils import DEFAULT_JOIN_CONFIG
+from ..database import SessionLocal
+from ..models import JoinUsConfiguration
+from ..schemas import ClubApplicationCreate
+
+# Prefix of the ``validation`` keys (``nameMinLength``...) -> (application field, section)
+_TEXT_FIELDS = {
+    "name": ("applicant_name", "personalInfo"),
+    "phone": ("phone", "personalInfo"),
+    "motivation": ("motivation", "motivation"),
+}
+_CHOICE_TYPES = ("select", "radio")
+_MULTIPLE_TYPES = ("multi-select", "checkbox")
+
+_CONFIG_COLUMNS = (
+    "id", "page_title", "page_subtitle", "header_gradient", "sections",
+    "available_clubs", "available_interests", "success_page", "terms_text",
+    "terms_description", "validation", "created_at", "updated_at",
+)
+
+
+class FieldRule(NamedTuple):
+    field: str
+    kind: str  # text, choice, multiple or boolean
+    required: bool = False
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    pattern: Optional[Pattern] = None
+    options: Optional[FrozenSet[str]] = None
+    message: Optional[str] = None
+
+
+def _length(rules: Dict[str, Any], key: str, where: str) -> Optional[int]:
+    value = rules.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"{where}.{key} must be a non-negative integer")
+    return value
+
+
+def _pattern(value: Any, where: str) -> Optional[Pattern]:
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{where} must be a string")
+    try:
+        return re.compile(value)
+    except re.error as exc:
+        raise ValueError(f"{where} is not a valid pattern: {exc}")
+
+
+def _check(rule: FieldRule, value: Any) -> Optional[str]:
+    """Return the error for ``value``, or ``None`` if it passes ``rule``."""
+    if value is None or value == "" or value == [] or (rule.kind == "boolean" and value is False):
+        return "This field is required" if rule.required else None
+    if rule.kind == "boolean":
+        return None if isinstance(value, bool) else "Must be true or false"
+    if rule.kind == "multiple":
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            return "Must be a list of options"
+        if rule.options is not None and not rule.options.issuperset(value):
+            return "Unknown option"
+        return None
+    if not isinstance(value, str):
+        return "Must be text"
+    if rule.options is not None:
+        return None if value in rule.options else "Unknown option"
+    length = len(value.strip())
+    if rule.min_length is not None and length < rule.min_length:
+        return rule.message or f"Must be at least {rule.min_length} characters"
+    if rule.max_length is not None and length > rule.max_length:
+        return rule.message or f"Must be at most {rule.max_length} characters"
+    if rule.pattern is not None and not rule.pattern.fullmatch(value):
+        return rule.message or "Invalid format"
+    return None
+
+
+class JoinFormValidator:
+    """A join form configuration compiled for validating applications.
+
+    Patterns are compiled, club and interest choices frozen into sets and
+    per-field rules tabled once, when the configuration is loaded or
+    saved, so checking a submission needs neither the database nor any
+    parsing. Invalid rules raise ``ValueError``. ``config`` is the
+    configuration as served to the form.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        sections = config.get("sections") or {}
+        enabled = {
+            name for name, section in sections.items()
+            if isinstance(section, dict) and section.get("isEnabled", True)
+        }
+        rules = config.get("validation") or {}
+
+        text_rules = []
+        for prefix, (field, section) in _TEXT_FIELDS.items():
+            if section in sections and section not in enabled:
+                continue
+            text_rules.append(FieldRule(
+                field,
+                "text",
+                min_length=_length(rules, f"{prefix}MinLength", "validation"),
+                max_length=_length(rules, f"{prefix}MaxLength", "validation"),
+                pattern=_pattern(rules.get(f"{prefix}Pattern"), f"validation.{prefix}Pattern"),
+            ))
+        self.text_rules = tuple(text_rules)
+
+        self.clubs: Optional[FrozenSet[str]] = None
+        if "clubPreferences" not in sections or "clubPreferences" in enabled:
+            self.clubs = frozenset(
+                str(club["id"]) for club in config.get("available_clubs") or ()
+                if isinstance(club, dict) and club.get("id") is not None and club.get("isActive", True)
+            )
+
+        self.interests: Optional[FrozenSet[str]] = None
+        if "interests" not in sections or "interests" in enabled:
+            self.interests = frozenset(
+                i for i in config.get("available_interests") or () if isinstance(i, str)
+            )
+
+        answer_rules = []
+        for name in sorted(enabled, key=lambda n: sections[n].get("order", 0)):
+            for position, field in enumerate(sections[name].get("fields") or ()):
+                where = f"sections.{name}.fields[{position}]"
+                if not isinstance(field, dict) or not isinstance(field.get("id"), str) or not field["id"]:
+                    raise ValueError(f"{where} needs a string id")
+                if not field.get("isVisible", True):
+                    continue
+                options = field.get("options")
+                if options is not None:
+                    options = frozenset(o for o in options if isinstance(o, str))
+                field_type = field.get("type", "text")
+                if field_type in _MULTIPLE_TYPES and options:
+                    kind = "multiple"
+                elif field_type == "checkbox":
+                    kind = "boolean"
+                elif field_type in _CHOICE_TYPES and options:
+                    kind = "choice"
+                else:
+                    kind, options = "text", None
+                checks = field.get("validation") or {}
+                answer_rules.append(FieldRule(
+                    field["id"],
+                    kind,
+                    required=bool(field.get("isRequired")),
+                    min_length=_length(checks, "minLength", where),
+                    max_length=_length(checks, "maxLength", where),
+                    pattern=_pattern(checks.get("pattern"), f"{where}.validation.pattern"),
+                    options=options,
+                    message=checks.get("customMessage") or None,
+                ))
+        self.answer_rules = tuple(answer_rules)
+
+    def validate(self, application: ClubApplicationCreate) -> List[Dict[str, str]]:
+        """Check a submission, returning one ``{"field", "error"}`` per problem."""
+        errors = []
+        for rule in self.text_rules:
+            error = _check(rule, getattr(application, rule.field))
+            if error:
+                errors.append({"field": rule.field, "error": error})
+        if self.clubs and application.preferred_club and application.preferred_club not in self.clubs:
+            errors.append({"field": "preferred_club", "error": "Unknown club"})
+        if self.interests:
+            if not application.interests:
+                errors.append({"field": "interests", "error": "Select at least one interest"})
+            elif not self.interests.issuperset(application.interests):
+                errors.append({"field": "interests", "error": "Unknown interest"})
+        for rule in self.answer_rules:
+            error = _check(rule, application.answers.get(rule.field))
+            if error:
+                errors.append({"field": f"answers.{rule.field}", "error": error})
+        return errors
+
+
+def config_dict(row: JoinUsConfiguration) -> Dict[str, Any]:
+    return {column: getattr(row, column) for column in _CONFIG_COLUMNS}
+
+
+def load_join_form() -> JoinFormValidator:
+    """Compile the active configuration: the latest saved one, or the defaults."""
+    with SessionLocal() as db:
+        row = db.query(JoinUsConfiguration).order_by(JoinUsConfiguration.id.desc()).first()
+        config = config_dict(row) if row is not None else DEFAULT_JOIN_CONFIG
+    return JoinFormValidator(config)
+
+
+# Saving a configuration swaps in its validator directly; the TTL picks up
+# changes saved through other workers
+join_form_cache = SWRCache(
+    ttl=settings.cache_ttl_seconds,
+    stale_while_revalidate=settings.cache_stale_while_revalidate_seconds,
+    stale_if_error=settings.cache_stale_if_error_seconds,
+    error_backoff=settings.cache_error_backoff_seconds,
+)
+
+
+async def current_join_form() -> JoinFormValidator:
+    return await join_form_cache.get("join_form", load_join_form)
+
+
+def activate_join_form(validator: JoinFormValidator) -> None:
+    join_form_cache.put("join_form", validator)
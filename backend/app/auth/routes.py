@@ -7,12 +7,17 @@ from ..database import get_db
 from ..models import User
 from ..schemas import UserLogin, Token, UserResponse, MessageResponse
 from ..config import settings
+from ..ratelimit import RateLimit
 from .utils import authenticate_user, create_access_token, get_current_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(RateLimit("login", settings.rate_limit_login))],
+)
 async def login_for_access_token(
     user_credentials: UserLogin,
     db: Session = Depends(get_db)
@@ -47,7 +52,11 @@ async def logout(current_user: User = Depends(get_current_user)) -> Any:
 
 
 # Simple admin login for development/demo purposes
-@router.post("/admin-login", response_model=Token)
+@router.post(
+    "/admin-login",
+    response_model=Token,
+    dependencies=[Depends(RateLimit("admin-login", settings.rate_limit_admin_login))],
+)
 async def admin_login(user_credentials: UserLogin) -> Any:
     """Simple admin login for development purposes."""
     if (user_credentials.email == settings.admin_email and 
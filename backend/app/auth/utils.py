@@ -13,6 +13,7 @@ from ..models import User
 # Security setup
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -73,6 +74,19 @@ def get_current_user(
     return user
 
 
+def get_optional_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Get the current user if a valid bearer token was sent, else None."""
+    if credentials is None:
+        return None
+    user_id = verify_token(credentials.credentials)
+    if user_id is None:
+        return None
+    return db.query(User).filter(User.id == user_id).first()
+
+
 def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
     """Get the current authenticated admin user."""
     if not current_user.is_admin:
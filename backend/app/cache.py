@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "generation", "failed_at")
+
+    def __init__(self, value: Any, loaded_at: float, generation: int):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.generation = generation
+        self.failed_at: Optional[float] = None
+
+
+class SWRCache:
+    """Async response cache with single-flight loading and stale serving.
+
+    Loaders are synchronous callables run in the threadpool, so they must
+    open their own database session. An entry's age decides how it is served:
+
+    * below ``ttl`` it is fresh and returned as is;
+    * up to ``ttl + stale_while_revalidate`` it is returned immediately while
+      one background task reloads it;
+    * up to ``ttl + stale_if_error`` callers wait for a reload but get the
+      stale value if the reload fails.
+
+    Only one load per key runs at a time and concurrent callers await it.
+    After a failed load stale values are served without retrying for
+    ``error_backoff`` seconds, so an outage does not make every request wait
+    on the database. ``invalidate`` makes every entry due for a reload while
+    keeping it as a fallback.
+    """
+
+    def __init__(self, ttl: float, stale_while_revalidate: float, stale_if_error: float,
+                 error_backoff: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.error_backoff = error_backoff
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                current = False
+            else:
+                self._entries.move_to_end(key)
+                current = entry.generation == self._generation
+        if entry is None:
+            return await self._load(key, loader)
+
+        age = now - entry.loaded_at
+        if current and age < self.ttl:
+            return entry.value
+        if current and age < self.ttl + self.stale_while_revalidate:
+            self._start(key, loader)
+            return entry.value
+        if age >= self.ttl + self.stale_if_error:
+            return await self._load(key, loader)
+        if entry.failed_at is not None and now - entry.failed_at < self.error_backoff:
+            return entry.value
+        try:
+            return await self._load(key, loader)
+        except Exception:
+            return entry.value
+
+    def invalidate(self) -> None:
+        """Mark all entries for reload. Safe to call from any thread."""
+        with self._lock:
+            self._generation += 1
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Replace ``key`` with a value built elsewhere, e.g. right after a write.
+
+        Loads already in flight are outdated by this and will not replace it.
+        """
+        with self._lock:
+            self._generation += 1
+            self._store(key, value, self._generation)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        # Shield so a disconnecting caller doesn't cancel the shared load
+        return await asyncio.shield(self._start(key, loader))
+
+    def _start(self, key: Hashable, loader: Callable[[], Any]) -> asyncio.Future:
+        task = self._inflight.get(key)
+        if task is None:
+            with self._lock:
+                generation = self._generation
+            task = asyncio.ensure_future(self._run(key, loader, generation))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Cache reload for %r failed: %s", key, task.exception())
+
+    async def _run(self, key: Hashable, loader: Callable[[], Any], generation: int) -> Any:
+        try:
+            value = await run_in_threadpool(loader)
+        except Exception:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.failed_at = time.monotonic()
+            raise
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation <= generation:
+                # A load that raced an invalidation is kept, but only as a fallback
+                self._store(key, value, generation)
+        return value
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        self._entries[key] = _Entry(value, time.monotonic(), generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def invalidate_on_commit(cache: SWRCache, *models) -> None:
+    """Invalidate ``cache`` after any commit that wrote one of ``models``.
+
+    ORM bulk statements skip mapper events and must call ``invalidate``.
+    """
+    def track(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("swr_caches", set()).add(cache)
+
+    for model in models:
+        for name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, name, track)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_caches(session):
+    for cache in session.info.pop("swr_caches", ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_caches(session):
+    session.info.pop("swr_caches", None)
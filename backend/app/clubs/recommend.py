@@ -0,0 +1,299 @@
+import heapq
+import math
+import operator
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+
+from ..config import settings
+from ..models import Club
+
+
+def normalize(term: str) -> str:
+    return term.strip().casefold()
+
+
+def _terms(features: Optional[Iterable[str]]) -> FrozenSet[str]:
+    return frozenset(normalize(f) for f in features or () if isinstance(f, str) and f.strip())
+
+
+def _not_before(column, since: datetime, bind):
+    if bind.dialect.name == "sqlite":
+        # SQLite compares datetimes as text, and func.now() stores no
+        # fractional seconds while bound datetimes always carry them
+        return func.datetime(column) >= func.datetime(since)
+    return column >= since
+
+
+def _bitset(ids: Sequence[int]) -> int:
+    """Build an int bitset from ascending club ids."""
+    if not ids:
+        return 0
+    buf = bytearray((ids[-1] >> 3) + 1)
+    for club_id in ids:
+        buf[club_id >> 3] |= 1 << (club_id & 7)
+    return int.from_bytes(buf, "little")
+
+
+class ClubRecommender:
+    """In-memory inverted index from club feature to club ids.
+
+    Every feature maps to a sorted ``array`` of club ids. Features shared by
+    at least ``dense_threshold`` clubs also keep an int bitset indexed by
+    club id, as do rating values, so set algebra over common features costs
+    a few machine-word passes instead of a scan.
+
+    A club's score for a set of interests is the sum of the IDF weights of
+    its matching features plus ``rating_weight * rating``. Because ratings
+    take only a handful of values, every score is fixed by the pair (subset
+    of interests matched, rating). Queries visit those pairs best first and
+    read club ids straight out of ``AND``/``AND NOT`` combinations of the
+    bitsets until ``k`` are found.
+    """
+
+    def __init__(self, rating_weight: float = 0.2, dense_threshold: int = 1024, max_terms: int = 8,
+                 sync_overlap: float = 60.0):
+        self.rating_weight = rating_weight
+        self.sync_overlap = sync_overlap
+        self.dense_threshold = dense_threshold
+        self.max_terms = max_terms
+        self._postings: Dict[str, array] = {}
+        self._dense: Dict[str, int] = {}
+        self._by_rating: Dict[int, int] = {}
+        self._features: Dict[int, FrozenSet[str]] = {}
+        self._ratings: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.synced_at: Optional[datetime] = None
+        self.checked_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _remove(self, club_id: int) -> None:
+        features = self._features.pop(club_id, None)
+        if features is None:
+            return
+        mask = ~(1 << club_id)
+        rating = self._ratings.pop(club_id)
+        self._by_rating[rating] &= mask
+        if not self._by_rating[rating]:
+            del self._by_rating[rating]
+        for feature in features:
+            postings = self._postings[feature]
+            index = bisect_left(postings, club_id)
+            if index < len(postings) and postings[index] == club_id:
+                del postings[index]
+            if not postings:
+                del self._postings[feature]
+                self._dense.pop(feature, None)
+            elif feature in self._dense:
+                if len(postings) < self.dense_threshold // 2:
+                    del self._dense[feature]
+                else:
+                    self._dense[feature] &= mask
+
+    def _add(self, club_id: int, features: Optional[Iterable[str]], rating: Optional[int]) -> None:
+        terms = _terms(features)
+        if not terms:
+            return
+        rating = rating or 0
+        bit = 1 << club_id
+        self._features[club_id] = terms
+        self._ratings[club_id] = rating
+        self._by_rating[rating] = self._by_rating.get(rating, 0) | bit
+        for feature in terms:
+            postings = self._postings.setdefault(feature, array("l"))
+            insort(postings, club_id)
+            if feature in self._dense:
+                self._dense[feature] |= bit
+            elif len(postings) >= self.dense_threshold:
+                self._dense[feature] = _bitset(postings)
+
+    def upsert(self, club_id: int, features: Optional[Iterable[str]], rating: Optional[int],
+               is_active: bool = True) -> None:
+        with self._lock:
+            self._remove(club_id)
+            if is_active:
+                self._add(club_id, features, rating)
+
+    def remove(self, club_id: int) -> None:
+        with self._lock:
+            self._remove(club_id)
+
+    def load(self, db: Session) -> None:
+        """Rebuild the whole index from the database."""
+        started = db.execute(select(func.now())).scalar()
+        rows = db.execute(
+            select(Club.id, Club.features, Club.rating)
+            .where(Club.is_active.is_(True))
+            .order_by(Club.id)
+        ).all()
+        postings: Dict[str, array] = {}
+        by_rating: Dict[int, List[int]] = {}
+        features: Dict[int, FrozenSet[str]] = {}
+        ratings: Dict[int, int] = {}
+        for club_id, club_features, rating in rows:
+            terms = _terms(club_features)
+            if not terms:
+                continue
+            features[club_id] = terms
+            ratings[club_id] = rating or 0
+            by_rating.setdefault(rating or 0, []).append(club_id)
+            for feature in terms:
+                postings.setdefault(feature, array("l")).append(club_id)
+        dense = {f: _bitset(ids) for f, ids in postings.items() if len(ids) >= self.dense_threshold}
+        with self._lock:
+            self._postings = postings
+            self._dense = dense
+            self._by_rating = {r: _bitset(ids) for r, ids in by_rating.items()}
+            self._features = features
+            self._ratings = ratings
+            self.synced_at = started
+            self.checked_at = time.monotonic()
+
+    def refresh(self, db: Session, club_ids: Sequence[int]) -> None:
+        """Reload specific clubs, e.g. after a bulk write that skipped mapper events."""
+        rows = db.execute(
+            select(Club.id, Club.features, Club.rating, Club.is_active).where(Club.id.in_(club_ids))
+        ).all()
+        found = set()
+        for club_id, features, rating, is_active in rows:
+            found.add(club_id)
+            self.upsert(club_id, features, rating, bool(is_active))
+        for club_id in set(club_ids) - found:
+            self.remove(club_id)
+
+    def sync(self, db: Session, interval: float) -> None:
+        """Apply changes made by other workers since the last sync.
+
+        Runs at most once per ``interval`` seconds. Clubs whose
+        ``updated_at`` is past the previous watermark, less ``sync_overlap``
+        seconds for transactions that committed after the watermark was
+        taken, are reloaded; the active id set is then diffed against the
+        index to drop clubs deleted elsewhere.
+        """
+        if self.synced_at is None:
+            self.load(db)
+            return
+        if time.monotonic() - self.checked_at < interval:
+            return
+        self.checked_at = time.monotonic()
+        started = db.execute(select(func.now())).scalar()
+        since = self.synced_at - timedelta(seconds=self.sync_overlap)
+        rows = db.execute(
+            select(Club.id, Club.features, Club.rating, Club.is_active)
+            .where(_not_before(Club.updated_at, since, db.get_bind()))
+        ).all()
+        for club_id, features, rating, is_active in rows:
+            self.upsert(club_id, features, rating, bool(is_active))
+
+        active = set(db.execute(select(Club.id).where(Club.is_active.is_(True))).scalars())
+        with self._lock:
+            gone = [club_id for club_id in self._features if club_id not in active]
+        for club_id in gone:
+            self.remove(club_id)
+        self.synced_at = started
+
+    def recommend(self, interests: Iterable[str], k: int = 10,
+                  exclude: FrozenSet[int] = frozenset()) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(club_id, score)`` pairs, best first."""
+        with self._lock:
+            total = len(self._features)
+            weighted = sorted(
+                (
+                    (math.log(1 + total / len(self._postings[term])), term)
+                    for term in _terms(interests)
+                    if term in self._postings
+                ),
+                reverse=True,
+            )[:self.max_terms]
+            # Bitsets are immutable ints, so the snapshot is safe to use unlocked
+            sets = [self._dense.get(term) or _bitset(self._postings[term]) for _, term in weighted]
+            by_rating = dict(self._by_rating)
+        if not weighted:
+            return []
+
+        weights = [w for w, _ in weighted]
+        subset_weight = [0.0] * (1 << len(weights))
+        for mask in range(1, len(subset_weight)):
+            low = mask & -mask
+            subset_weight[mask] = subset_weight[mask ^ low] + weights[low.bit_length() - 1]
+        masks = sorted(range(1, len(subset_weight)), key=subset_weight.__getitem__, reverse=True)
+
+        def pairs(rating: int):
+            bonus = self.rating_weight * rating
+            return ((subset_weight[mask] + bonus, mask, rating) for mask in masks)
+
+        candidates = heapq.merge(*map(pairs, sorted(by_rating, reverse=True)), reverse=True)
+        excluded = _bitset(sorted(exclude))
+        full = len(subset_weight) - 1
+        intersections = {0: -1}
+        unions = {0: excluded}
+
+        def combine(cache: Dict[int, int], mask: int, op) -> int:
+            if mask not in cache:
+                low = mask & -mask
+                cache[mask] = op(combine(cache, mask ^ low, op), sets[low.bit_length() - 1])
+            return cache[mask]
+
+        results: List[Tuple[int, float]] = []
+        for score, mask, rating in candidates:
+            # Clubs with this rating matching exactly this subset of interests
+            matches = combine(intersections, mask, operator.and_)
+            if matches:
+                matches &= by_rating[rating]
+            if matches:
+                matches &= ~combine(unions, full ^ mask, operator.or_)
+            while matches and len(results) < k:
+                low = matches & -matches
+                results.append((low.bit_length() - 1, round(score, 4)))
+                matches ^= low
+            if len(results) == k:
+                break
+        return results
+
+
+recommender = ClubRecommender(
+    rating_weight=settings.recommend_rating_weight,
+    sync_overlap=settings.recommend_sync_overlap_seconds,
+)
+
+
+@event.listens_for(Club, "after_insert")
+@event.listens_for(Club, "after_update")
+def _track_club_change(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("recommender_clubs", {})[target.id] = (
+            list(target.features or ()), target.rating, bool(target.is_active)
+        )
+
+
+@event.listens_for(Club, "after_delete")
+def _track_club_delete(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("recommender_clubs", {})[target.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_club_changes(session):
+    changes = session.info.pop("recommender_clubs", None)
+    if not changes or recommender.synced_at is None:
+        return
+    for club_id, state in changes.items():
+        if state is None:
+            recommender.remove(club_id)
+        else:
+            recommender.upsert(club_id, *state)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_club_changes(session):
+    session.info.pop("recommender_clubs", None)
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+
+from ..auth.utils import get_optional_current_user
+from ..config import settings
+from ..database import get_db
+from ..geo import find_nearby
+from ..models import Club, ClubMembership, User
+from ..schemas import NearbyClubsResponse, RecommendedClubsResponse
+from ..events.ical import calendar_response, ical_feeds
+from .recommend import recommender
+
+router = APIRouter(prefix="/clubs", tags=["Clubs"])
+
+
+@router.get("/nearby", response_model=NearbyClubsResponse)
+async def get_nearby_clubs(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(settings.nearby_default_radius_km, gt=0, le=settings.nearby_max_radius_km),
+    limit: int = Query(20, ge=1, le=settings.nearby_max_results),
+    db: Session = Depends(get_db),
+) -> Any:
+    """Get active clubs within ``radius_km`` of a point, nearest first."""
+    clubs = find_nearby(
+        db,
+        Club,
+        (Club.id, Club.name, Club.location, Club.image, Club.rating,
+         Club.member_count, Club.latitude, Club.longitude),
+        lat, lon, radius_km, limit,
+        Club.is_active.is_(True),
+    )
+    return {"clubs": clubs, "total": len(clubs)}
+
+
+@router.get("/recommended", response_model=RecommendedClubsResponse)
+async def get_recommended_clubs(
+    interests: Optional[str] = Query(None, description="Comma-separated interests"),
+    limit: int = Query(10, ge=1, le=settings.recommend_max_results),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user),
+) -> Any:
+    """Recommend clubs whose features overlap the given or the user's interests.
+
+    Clubs the signed-in user already belongs to are left out.
+    """
+    if interests:
+        terms = interests.split(",")
+    elif current_user is not None:
+        terms = current_user.interests or []
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide interests or sign in",
+        )
+
+    exclude = frozenset()
+    if current_user is not None:
+        exclude = frozenset(db.execute(
+            select(ClubMembership.club_id).where(
+                ClubMembership.user_id == current_user.id,
+                ClubMembership.is_active.is_(True),
+            )
+        ).scalars())
+
+    recommender.sync(db, settings.recommend_sync_interval_seconds)
+    # Over-fetch so clubs deactivated or deleted since the last sync don't
+    # leave the page short
+    scores = dict(recommender.recommend(terms, limit * 2, exclude))
+    if not scores:
+        return {"clubs": [], "total": 0}
+
+    rows = db.execute(
+        select(Club.id, Club.name, Club.description, Club.location, Club.image,
+               Club.rating, Club.member_count, Club.features)
+        .where(Club.id.in_(scores), Club.is_active.is_(True))
+    ).all()
+    for club_id in scores.keys() - {row.id for row in rows}:
+        recommender.remove(club_id)
+    results = sorted(
+        ({**row._mapping, "score": scores[row.id]} for row in rows),
+        key=lambda club: (-club["score"], club["id"]),
+    )[:limit]
+    return {"clubs": results, "total": len(results)}
+
+
+@router.get("/{club_id}/events.ics")
+async def get_club_calendar(club_id: int, request: Request) -> Response:
+    """Subscribe to a club's events as an iCalendar feed."""
+    feed = ical_feeds.get(club_id)
+    if feed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Club not found",
+        )
+    etag, body = feed
+    return calendar_response(request, etag, body)
@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from ..cache import SWRCache, invalidate_on_commit
+from ..config import settings
+from ..database import SessionLocal
+from ..json_lists import contains_all
+from ..models import Club
+from ..schemas import ClubListAdapter, dump_list_json
+
+clubs_cache = SWRCache(
+    ttl=settings.cache_ttl_seconds,
+    stale_while_revalidate=settings.cache_stale_while_revalidate_seconds,
+    stale_if_error=settings.cache_stale_if_error_seconds,
+    error_backoff=settings.cache_error_backoff_seconds,
+)
+invalidate_on_commit(clubs_cache, Club)
+
+
+def load_club_list(features: Sequence[str]) -> bytes:
+    """Render the active club list, optionally filtered by features, as JSON."""
+    with SessionLocal() as db:
+        query = db.query(Club).filter(Club.is_active == True)
+        if features:
+            query = query.filter(contains_all(Club, features, db.get_bind()))
+        clubs = query.all()
+        body = dump_list_json(ClubListAdapter, clubs)
+    return b'{"clubs":%s,"total":%d}' % (body, len(clubs))
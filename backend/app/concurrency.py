@@ -0,0 +1,232 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .config import settings
+
+# Latencies under a millisecond are timer noise; never judge against less
+_MIN_BASELINE = 0.001
+
+
+class AdaptiveLimit:
+    """Concurrency limit adjusted by AIMD on observed latency.
+
+    Each completion is compared with the baseline of its own route, so a
+    class mixing 1 ms cache hits with 20 ms queries does not mistake the
+    slow routes for congestion. A baseline is the fastest successful (2xx or
+    3xx) latency over the last one to two ``baseline_window`` periods: cheap
+    error paths such as a 429 or 404 never set it, and it can rise as a
+    route genuinely gets slower, but only after minutes, not under a burst
+    of overload.
+
+    The limit grows by about one slot per ``limit`` fast completions while it
+    is fully used. Completions are judged together once per ``window``
+    seconds: when at least half of them took more than ``tolerance`` times
+    their baseline or failed with a server error, the limit is cut by
+    ``backoff``. So a burst of slow responses costs one cut per window, not
+    one per response.
+
+    Callers that find no free slot wait in FIFO order for up to the queue
+    timeout. The class is not thread-safe; use it from the event loop.
+    """
+
+    def __init__(self, name: str, initial: int, min_limit: int, max_limit: int,
+                 tolerance: float = 2.0, backoff: float = 0.9, window: float = 0.1,
+                 baseline_window: float = 300.0):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.window = window
+        self.baseline_window = baseline_window
+        self.in_flight = 0
+        # route -> (window start, minimum this window, minimum last window)
+        self._minima: Dict[str, Tuple[float, float, float]] = {}
+        self.rejected = 0
+        self._ratios: List[float] = []
+        self._window_started = time.monotonic()
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self._has_slot() and not self._waiters:
+            self.in_flight += 1
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        granted = False
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            granted = True
+            return True
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            if not granted:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as we gave up
+                    self.release(None, None)
+                else:
+                    waiter.cancel()
+                    self._waiters.remove(waiter)
+
+    def release(self, latency: Optional[float], status: Optional[int], route: str = "") -> None:
+        """Free a slot. ``status`` is ``None`` when no response was sent."""
+        self.in_flight -= 1
+        if latency is not None:
+            self._update(route, latency, status)
+        while self._waiters and self._has_slot():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    @property
+    def baselines(self) -> Dict[str, float]:
+        return {route: min(current, previous) for route, (_, current, previous) in self._minima.items()}
+
+    def _observe(self, route: str, latency: float, now: float) -> float:
+        """Record a successful latency and return the route's baseline."""
+        started, current, previous = self._minima.get(route, (now, math.inf, math.inf))
+        if now - started >= self.baseline_window:
+            # A quiet route may have skipped whole windows; those hold no minimum
+            previous = current if now - started < 2 * self.baseline_window else math.inf
+            started, current = now, math.inf
+        current = min(current, latency)
+        self._minima[route] = (started, current, previous)
+        return min(current, previous)
+
+    def _update(self, route: str, latency: float, status: Optional[int]) -> None:
+        now = time.monotonic()
+        if status is None or status >= 500:
+            ratio = math.inf
+        elif status >= 400:
+            # Client errors say nothing about how loaded the route is
+            ratio = None
+        else:
+            baseline = self._observe(route, latency, now)
+            ratio = latency / max(baseline, _MIN_BASELINE)
+        if ratio is not None:
+            self._ratios.append(ratio)
+            if ratio <= self.tolerance and self.in_flight + 1 >= int(self.limit):
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+        if now - self._window_started >= self.window:
+            ratios = sorted(self._ratios)
+            if ratios and ratios[len(ratios) // 2] > self.tolerance:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._ratios = []
+            self._window_started = now
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "baselines_ms": {route: round(b * 1000, 1) for route, b in self.baselines.items()},
+            "rejected": self.rejected,
+        }
+
+
+def _limit(name: str, initial: int) -> AdaptiveLimit:
+    return AdaptiveLimit(
+        name,
+        initial=initial,
+        min_limit=settings.concurrency_min_limit,
+        max_limit=max(initial, settings.concurrency_max_limit),
+        tolerance=settings.concurrency_latency_tolerance,
+        window=settings.concurrency_window_seconds,
+        baseline_window=settings.concurrency_baseline_window_seconds,
+    )
+
+
+limits: Dict[str, AdaptiveLimit] = {
+    "read": _limit("read", settings.concurrency_read_limit),
+    "auth": _limit("auth", settings.concurrency_auth_limit),
+    "write": _limit("write", settings.concurrency_write_limit),
+}
+
+# Long-lived or trivial endpoints that must not hold or wait for a slot
+_EXEMPT_PREFIXES = ("/health", "/uploads", "/api/events/live", "/api/docs", "/api/redoc", "/openapi.json")
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Map a request to its limit: auth, public reads, or writes."""
+    if method == "OPTIONS" or path.startswith(_EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/api/auth"):
+        return "auth"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+class ConcurrencyLimitMiddleware:
+    """Cap in-flight requests per route class and shed load past a short wait.
+
+    A slot is held until the response starts, so streaming bodies do not
+    count against the limit. Requests that cannot get a slot within the
+    queue timeout are answered with 503 and ``Retry-After``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.concurrency_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = limits[name]
+        if not await limit.acquire(settings.concurrency_queue_timeout_seconds):
+            await _reject(send)
+            return
+
+        started = time.monotonic()
+        held = True
+
+        async def send_wrapper(message):
+            nonlocal held
+            if held and message["type"] == "http.response.start":
+                held = False
+                limit.release(time.monotonic() - started, message["status"], _route_key(scope))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if held:
+                # Failed or disconnected before responding
+                limit.release(time.monotonic() - started, None, _route_key(scope))
+
+
+def _route_key(scope) -> str:
+    """The matched route's path template, so baselines stay one per endpoint."""
+    route = scope.get("route")
+    return getattr(route, "path", "")
+
+
+async def _reject(send) -> None:
+    body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(math.ceil(settings.concurrency_retry_after_seconds)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -8,6 +8,9 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = ""
+    database_replica_urls: list = []
+    replica_max_lag_seconds: float = 5.0
+    replica_check_interval_seconds: float = 5.0
     
     # Security
     secret_key: str = "your-secret-key-here"
@@ -22,10 +25,86 @@ class Settings(BaseSettings):
     upload_path: str = "uploads"
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: list = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+    # Unreferenced media blobs are kept this long before garbage collection
+    media_gc_grace_seconds: int = 3600
     
     # CORS
     allowed_origins: list = ["http://localhost:5000", "http://0.0.0.0:5000"]
     
+    # Admin bulk operations
+    bulk_max_items: int = 5000
+    export_batch_size: int = 1000
+    
+    # Adaptive concurrency limits per worker (reads, auth, writes)
+    concurrency_limit_enabled: bool = True
+    concurrency_read_limit: int = 64
+    concurrency_auth_limit: int = 8
+    concurrency_write_limit: int = 16
+    concurrency_min_limit: int = 2
+    concurrency_max_limit: int = 256
+    concurrency_latency_tolerance: float = 2.0
+    # Latencies are judged per window, so the limit is cut at most once per window
+    concurrency_window_seconds: float = 0.1
+    # Per-route latency baselines are minima over this window and the previous one
+    concurrency_baseline_window_seconds: float = 300.0
+    concurrency_queue_timeout_seconds: float = 0.5
+    concurrency_retry_after_seconds: float = 1.0
+    
+    # Request profiling (middleware is only installed when enabled)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_interval_seconds: float = 0.005
+    profiling_dir: str = "profiles"
+    profiling_max_files: int = 200
+    
+    # Response caching (stale-while-revalidate)
+    cache_ttl_seconds: float = 30.0
+    cache_stale_while_revalidate_seconds: float = 300.0
+    cache_stale_if_error_seconds: float = 86400.0
+    cache_error_backoff_seconds: float = 5.0
+    
+    # iCalendar feeds
+    ical_cache_ttl_seconds: float = 300.0
+    ical_past_days: int = 90
+    
+    # Application review queue
+    applications_page_size: int = 50
+    applications_max_page_size: int = 200
+    
+    # News
+    news_page_size: int = 20
+    news_max_page_size: int = 100
+    news_cache_size: int = 1024
+    news_cache_ttl_seconds: int = 60
+    
+    # Nearby search
+    nearby_default_radius_km: float = 50.0
+    nearby_max_radius_km: float = 1000.0
+    nearby_max_results: int = 100
+    
+    # Club recommendations
+    recommend_rating_weight: float = 0.2
+    recommend_sync_interval_seconds: float = 30.0
+    # Re-read this much updated_at history each sync to catch late commits
+    recommend_sync_overlap_seconds: float = 60.0
+    recommend_max_results: int = 50
+    
+    # Live event updates (Server-Sent Events)
+    live_updates_redis_url: str = ""
+    live_updates_interval_seconds: float = 1.0
+    # Distinct events a slow subscriber may have pending before it must resync
+    live_updates_queue_size: int = 100
+    live_updates_keepalive_seconds: float = 15.0
+    
+    # Rate limiting ("<count>/<second|minute|hour|day>")
+    rate_limit_enabled: bool = True
+    rate_limit_redis_url: str = ""
+    rate_limit_max_keys: int = 100_000
+    rate_limit_trust_forwarded: bool = False
+    rate_limit_login: str = "10/minute"
+    rate_limit_admin_login: str = "5/minute"
+    rate_limit_applications: str = "5/hour"
+    
     # Environment
     environment: str = "development"
     debug: bool = True
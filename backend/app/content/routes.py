@@ -0,0 +1,147 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+
+from ..applications.validation import (
+    JoinFormValidator,
+    activate_join_form,
+    config_dict,
+    current_join_form,
+)
+from ..auth.utils import get_current_admin_user
+from ..config import settings
+from ..database import get_db
+from ..json_lists import contains_all, parse_values
+from ..models import JoinUsConfiguration, NewsArticle, User
+from ..schemas import (
+    JoinUsConfigResponse,
+    JoinUsConfigUpdate,
+    NewsArticleResponse,
+    NewsArticleSummaryListAdapter,
+    NewsFeedResponse,
+    dump_list_json,
+)
+from .utils import DEFAULT_JOIN_CONFIG, decode_cursor, encode_cursor, keyset_time, news_slug_cache
+
+router = APIRouter(prefix="/news", tags=["News"])
+content_router = APIRouter(prefix="/content", tags=["Content"])
+
+# Columns returned by the feed; the article body is only served by slug.
+_SUMMARY_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.title,
+    NewsArticle.slug,
+    NewsArticle.excerpt,
+    NewsArticle.featured_image,
+    NewsArticle.category,
+    NewsArticle.tags,
+    NewsArticle.is_featured,
+    NewsArticle.published_at,
+)
+
+
+@router.get("", response_model=NewsFeedResponse)
+async def list_news(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.news_page_size, ge=1, le=settings.news_max_page_size),
+    featured: Optional[bool] = None,
+    tags: Optional[str] = Query(None, description="Comma-separated tags, all required"),
+    db: Session = Depends(get_db),
+) -> Any:
+    """List published articles, newest first, paginated by keyset cursor."""
+    query = db.query(*_SUMMARY_COLUMNS).filter(
+        NewsArticle.is_published.is_(True),
+        NewsArticle.published_at.isnot(None),
+    )
+    if featured is not None:
+        query = query.filter(NewsArticle.is_featured == featured)
+    bind = db.get_bind()
+    tag_values = parse_values(tags)
+    if tag_values:
+        query = query.filter(contains_all(NewsArticle, tag_values, bind))
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.filter(
+            tuple_(keyset_time(NewsArticle.published_at, bind), NewsArticle.id)
+            < tuple_(keyset_time(position[0], bind), position[1])
+        )
+
+    rows = (
+        query.order_by(keyset_time(NewsArticle.published_at, bind).desc(), NewsArticle.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].published_at, rows[-1].id)
+
+    body = dump_list_json(NewsArticleSummaryListAdapter, rows)
+    return Response(
+        content=b'{"articles":%s,"next_cursor":%s}' % (body, json.dumps(next_cursor).encode()),
+        media_type="application/json",
+    )
+
+
+@router.get("/{slug}", response_model=NewsArticleResponse)
+async def get_news_article(slug: str, db: Session = Depends(get_db)) -> Any:
+    """Get a published article by slug."""
+    cached = news_slug_cache.get(slug)
+    if cached is not None:
+        return cached
+
+    article = db.query(NewsArticle).filter(
+        NewsArticle.slug == slug,
+        NewsArticle.is_published.is_(True),
+    ).first()
+    if article is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found",
+        )
+
+    data = NewsArticleResponse.model_validate(article).model_dump()
+    news_slug_cache.set(slug, data)
+    return data
+
+
+@content_router.get("/join-config")
+async def get_join_config() -> Any:
+    """Get the active Join Us form configuration."""
+    return (await current_join_form()).config
+
+
+@content_router.put("/join-config", response_model=JoinUsConfigResponse)
+async def update_join_config(
+    config_update: JoinUsConfigUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """Update the Join Us form configuration and the rules applications are checked against."""
+    config = db.query(JoinUsConfiguration).order_by(JoinUsConfiguration.id.desc()).first()
+    if config is None:
+        config = JoinUsConfiguration(**{k: v for k, v in DEFAULT_JOIN_CONFIG.items() if k != "id"})
+        db.add(config)
+    for field, value in config_update.model_dump(exclude_none=True).items():
+        setattr(config, field, value)
+    db.flush()
+    db.refresh(config)
+    try:
+        validator = JoinFormValidator(config_dict(config))
+    except ValueError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        )
+    db.commit()
+    activate_join_form(validator)
+    return validator.config
@@ -0,0 +1,252 @@
+import base64
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, event, func, inspect, literal
+from sqlalchemy.orm import Session, object_session
+
+from ..cache import SWRCache, invalidate_on_commit
+from ..config import settings
+from ..database import SessionLocal
+from ..models import LandingSection, NewsArticle
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with a per-entry time to live.
+
+    The TTL bounds how long another worker's edits can stay invisible, since
+    invalidation events only reach the process that made the change.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+news_slug_cache = LRUCache(settings.news_cache_size, settings.news_cache_ttl_seconds)
+
+landing_cache = SWRCache(
+    ttl=settings.cache_ttl_seconds,
+    stale_while_revalidate=settings.cache_stale_while_revalidate_seconds,
+    stale_if_error=settings.cache_stale_if_error_seconds,
+    error_backoff=settings.cache_error_backoff_seconds,
+)
+invalidate_on_commit(landing_cache, LandingSection)
+
+# Served until landing sections are created in the database
+DEFAULT_LANDING_SECTIONS = [
+    {
+        "id": 1,
+        "key": "hero",
+        "type": "hero",
+        "title": "Discover Morocco's Adventure Clubs",
+        "subtitle": "Join passionate communities exploring the Kingdom's wonders",
+        "data": {
+            "backgroundImage": "/images/hero-bg.jpg",
+            "ctaText": "Explore Clubs",
+            "ctaLink": "/clubs"
+        },
+        "is_visible": True,
+        "order": 1
+    },
+    {
+        "id": 2,
+        "key": "activities",
+        "type": "activities",
+        "title": "Popular Activities",
+        "subtitle": "Discover amazing adventures across Morocco",
+        "data": {
+            "activities": [
+                {
+                    "name": "Mountain Hiking",
+                    "description": "Explore the Atlas Mountains",
+                    "image": "/images/hiking.jpg",
+                    "difficulty": "Moderate"
+                },
+                {
+                    "name": "Desert Camping",
+                    "description": "Sleep under Sahara stars",
+                    "image": "/images/camping.jpg",
+                    "difficulty": "Easy"
+                }
+            ]
+        },
+        "is_visible": True,
+        "order": 2
+    }
+]
+
+
+# Served until an admin saves a join form configuration
+DEFAULT_JOIN_CONFIG = {
+    "id": 1,
+    "page_title": "Join Our Adventure Community",
+    "page_subtitle": "Ready to explore Morocco's wonders with like-minded adventurers?",
+    "sections": {
+        "personalInfo": {
+            "isEnabled": True,
+            "title": "Personal Information",
+            "description": "Basic details about yourself",
+            "icon": "User",
+            "order": 1
+        },
+        "clubPreferences": {
+            "isEnabled": True,
+            "title": "Club Preferences",
+            "description": "Choose your preferred club",
+            "icon": "MapPin",
+            "order": 2
+        },
+        "interests": {
+            "isEnabled": True,
+            "title": "Your Interests",
+            "description": "Select your favorite activities",
+            "icon": "Heart",
+            "order": 3
+        },
+        "motivation": {
+            "isEnabled": True,
+            "title": "Tell Us About Yourself",
+            "description": "Share your motivation",
+            "icon": "FileText",
+            "order": 4
+        }
+    },
+    "available_clubs": [
+        {
+            "id": "atlas-hikers",
+            "name": "Atlas Hikers Club",
+            "description": "Mountain trekking adventures",
+            "members": "250+ Members",
+            "isActive": True
+        },
+        {
+            "id": "desert-explorers",
+            "name": "Desert Explorers",
+            "description": "Sahara expeditions",
+            "members": "180+ Members",
+            "isActive": True
+        }
+    ],
+    "available_interests": [
+        "Hiking", "Camping", "Photography", "Desert Tours", 
+        "Beach Activities", "Cultural Tours", "Adventure Sports"
+    ],
+    "validation": {
+        "nameMinLength": 2,
+        "phoneMinLength": 10,
+        "motivationMinLength": 50
+    }
+}
+
+
+def load_landing_sections() -> Dict[str, Any]:
+    """Load visible landing sections, falling back to the defaults."""
+    with SessionLocal() as db:
+        sections = (
+            db.query(LandingSection)
+            .filter(LandingSection.is_visible.is_(True))
+            .order_by(LandingSection.order, LandingSection.id)
+            .all()
+        )
+        if not sections:
+            return {"sections": DEFAULT_LANDING_SECTIONS}
+        return {
+            "sections": [
+                {
+                    "id": section.id,
+                    "key": section.key,
+                    "type": section.type,
+                    "title": section.title,
+                    "subtitle": section.subtitle,
+                    "data": section.data or {},
+                    "design": section.design or {},
+                    "is_visible": section.is_visible,
+                    "order": section.order,
+                }
+                for section in sections
+            ]
+        }
+
+
+def keyset_time(value, bind):
+    """Return a datetime column or value in a form that compares in time order.
+
+    SQLite stores datetimes as text, with fractional seconds only when the
+    value had any (``func.now()`` has none), so a row can compare below a
+    bound cursor from the same second. Both sides are normalized there.
+    """
+    if isinstance(value, datetime):
+        value = literal(value, DateTime())
+    if bind.dialect.name == "sqlite":
+        return func.strftime("%Y-%m-%d %H:%M:%f", value)
+    return value
+
+
+def encode_cursor(published_at: datetime, article_id: int) -> str:
+    """Encode a ``(published_at, id)`` keyset position as an opaque cursor."""
+    raw = f"{published_at.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by :func:`encode_cursor`. Raises ``ValueError``."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    published_at, article_id = base64.urlsafe_b64decode(padded).decode().split("|")
+    return datetime.fromisoformat(published_at), int(article_id)
+
+
+@event.listens_for(NewsArticle, "after_insert")
+@event.listens_for(NewsArticle, "after_update")
+@event.listens_for(NewsArticle, "after_delete")
+def _track_changed_slugs(mapper, connection, target):
+    """Remember every slug an article had so it can be evicted on commit."""
+    session = object_session(target)
+    if session is None:
+        return
+    history = inspect(target).attrs.slug.history
+    slugs = session.info.setdefault("news_dirty_slugs", set())
+    slugs.update(s for s in (*history.deleted, *history.unchanged, *history.added) if s)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_slugs(session):
+    for slug in session.info.pop("news_dirty_slugs", ()):
+        news_slug_cache.pop(slug)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_slugs(session):
+    session.info.pop("news_dirty_slugs", None)
@@ -1,11 +1,23 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import Table, create_engine, event, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.schema import CreateColumn
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
+import contextlib
+import itertools
+import logging
+import threading
 import os
 
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 # Database connection
 engine = create_engine(
     settings.database_url,
@@ -13,19 +25,306 @@ engine = create_engine(
     echo=settings.debug
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class ReplicaSet:
+    """Read replicas with periodic health and lag checks.
+
+    Replicas are probed by a background task every ``check_interval``
+    seconds (see ``start``), never on the request path: ``pick`` only reads
+    the last results. Replicas that fail to answer or report more than
+    ``max_lag`` seconds of replication lag are skipped until a later check
+    finds them healthy again.
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float):
+        self.engines: List[Engine] = [
+            create_engine(url, pool_pre_ping=True, echo=settings.debug) for url in urls
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._healthy: Dict[Engine, bool] = {e: True for e in self.engines}
+        self._cycle = itertools.cycle(self.engines) if self.engines else None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def lag(self, replica: Engine) -> float:
+        """Return the replica's replication lag in seconds."""
+        with replica.connect() as conn:
+            if replica.dialect.name == "postgresql":
+                return float(conn.execute(text(
+                    "SELECT CASE WHEN pg_is_in_recovery() THEN COALESCE("
+                    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                    "ELSE 0 END"
+                )).scalar() or 0)
+            conn.execute(text("SELECT 1"))
+            return 0.0
+
+    def check(self, replica: Engine) -> bool:
+        """Refresh and return the health of one replica."""
+        try:
+            lag = self.lag(replica)
+            healthy = lag <= self.max_lag
+            if not healthy:
+                logger.warning("Replica %s is %.1fs behind, taking it out of rotation",
+                               replica.url.render_as_string(), lag)
+        except Exception as exc:
+            logger.warning("Replica %s failed health check: %s",
+                           replica.url.render_as_string(), exc)
+            healthy = False
+        self._healthy[replica] = healthy
+        return healthy
+
+    def check_all(self) -> None:
+        for replica in self.engines:
+            self.check(replica)
+
+    async def start(self) -> None:
+        """Check every replica now, then keep checking in the background."""
+        if not self.engines:
+            return
+        await run_in_threadpool(self.check_all)
+        self._task = asyncio.create_task(self._check_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await run_in_threadpool(self.check_all)
+            except Exception:
+                logger.exception("Replica health check failed")
+
+    def pick(self) -> Optional[Engine]:
+        """Return the next healthy replica in round-robin order, if any."""
+        if self._cycle is None:
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                replica = next(self._cycle)
+            if self._healthy[replica]:
+                return replica
+        return None
+
+    def status(self) -> List[Dict[str, object]]:
+        return [
+            {"url": e.url.render_as_string(), "healthy": self._healthy[e]}
+            for e in self.engines
+        ]
+
+
+replicas = ReplicaSet(
+    settings.database_replica_urls,
+    max_lag=settings.replica_max_lag_seconds,
+    check_interval=settings.replica_check_interval_seconds,
+)
+
+
+class RoutingSession(Session):
+    """Session that sends plain reads to a replica and everything else to the primary.
+
+    A session picks one replica for its first read and keeps it, so all of
+    a request's reads see the same replica. Once a session has flushed or
+    executed a write, all of its later reads go to the primary as well so a
+    request always sees its own writes. Setting
+    ``session.info["use_primary"] = True`` pins a session to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not replicas:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self._flushing or self.info.get("use_primary"):
+            return engine
+        if clause is None or not getattr(clause, "is_select", False) \
+                or getattr(clause, "_for_update_arg", None) is not None:
+            if clause is not None:
+                self.info["use_primary"] = True
+            return engine
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = replicas.pick() or engine
+        return replica
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(session, flush_context):
+    session.info["use_primary"] = True
+
+
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession
+)
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency to get database session."""
-    db = SessionLocal()
+class LazySession:
+    """Stand-in for a request's ``Session`` that is only created when used.
+
+    Attribute access creates the real session, which in turn checks out a
+    connection on its first query, so requests that never touch the
+    database never touch the pool either. ``use_primary`` pins the session
+    to the primary before its first statement.
+    """
+
+    __slots__ = ("_session", "_use_primary")
+
+    def __init__(self, use_primary: bool = False):
+        self._session: Optional[Session] = None
+        self._use_primary = use_primary
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = SessionLocal()
+            if self._use_primary:
+                self._session.info["use_primary"] = True
+        return getattr(self._session, name)
+
+    async def release(self) -> None:
+        """Close the session, returning its connection to the pool."""
+        session, self._session = self._session, None
+        if session is None:
+            return
+        if session.in_transaction():
+            # Rolling back the open transaction talks to the database
+            await run_in_threadpool(session.close)
+        else:
+            session.close()
+
+
+# Scope key under which SessionReleaseMiddleware collects request sessions
+_SESSIONS_KEY = "db_sessions"
+
+
+class SessionReleaseMiddleware:
+    """Release request sessions as soon as the response starts.
+
+    Dependency teardown only runs after the whole body has been sent, which
+    for large or streaming responses would hold a pooled connection for the
+    duration of the transfer.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sessions: List[LazySession] = []
+        scope[_SESSIONS_KEY] = sessions
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                await _release_all(sessions)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            await _release_all(sessions)
+
+
+async def _release_all(sessions: List[LazySession]) -> None:
+    while sessions:
+        await sessions.pop().release()
+
+
+async def get_db(request: Request) -> AsyncGenerator[Session, None]:
+    """Dependency to get database session.
+
+    Only GET and HEAD requests may read from a replica; anything else may
+    write, and its reads before the first write must see the primary too.
+    """
+    db = LazySession(use_primary=request.method not in ("GET", "HEAD"))
+    request.scope.get(_SESSIONS_KEY, []).append(db)
     try:
         yield db
     finally:
-        db.close()
+        await db.release()
+
+
+def pool_status(bind: Engine = engine) -> Dict[str, Any]:
+    """Report connection pool usage without checking out a connection."""
+    pool = bind.pool
+    if not hasattr(pool, "checkedout"):
+        # Pools without a fixed size (e.g. NullPool) cannot run out
+        return {"ready": True, "pool": type(pool).__name__}
+    checked_out = pool.checkedout()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    capacity = None if max_overflow < 0 else pool.size() + max_overflow
+    return {
+        "ready": capacity is None or checked_out < capacity,
+        "pool": type(pool).__name__,
+        "checked_out": checked_out,
+        "capacity": capacity,
+    }
+
+
+def schema_tables(dialect) -> List[Table]:
+    """Tables to create on ``dialect``.
+
+    JSON list side tables are only read where there is no JSONB/GIN, so they
+    are left out on Postgres.
+    """
+    return [
+        table for table in Base.metadata.sorted_tables
+        if not (table.info.get("json_side_table") and dialect.name == "postgresql")
+    ]
+
+
+def create_tables(bind: Engine = engine):
+    """Create all database tables, and upgrade the ones that already exist."""
+    tables = schema_tables(bind.dialect)
+    with bind.begin() as connection:
+        existing = [table for table in tables if inspect(connection).has_table(table.name)]
+    Base.metadata.create_all(bind=bind, tables=tables)
+    with bind.begin() as connection:
+        for table in existing:
+            upgrade_table(connection, table)
+
+
+def upgrade_table(connection, table: Table) -> None:
+    """Bring an existing table up to its model definition.
 
+    ``create_all`` skips tables that exist, so columns and indexes added to
+    a model later are added here: missing columns are appended with
+    ``ALTER TABLE ... ADD COLUMN`` and missing indexes created. On Postgres,
+    ``json`` columns whose model type is now ``jsonb`` are converted. Changed
+    definitions of existing columns or indexes are left alone.
+    """
+    inspector = inspect(connection)
+    dialect = connection.dialect
+    columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in columns:
+            ddl = CreateColumn(column).compile(dialect=dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+            logger.info("Added column %s.%s", table.name, column.name)
+        elif dialect.name == "postgresql" and isinstance(column.type.dialect_impl(dialect), JSONB) \
+                and not isinstance(columns[column.name]["type"], JSONB):
+            connection.execute(text(
+                f"ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE jsonb USING {column.name}::jsonb"
+            ))
+            logger.info("Converted %s.%s to jsonb", table.name, column.name)
 
-def create_tables():
-    """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+    if dialect.name == "sqlite":
+        # Expression indexes are not reflected on SQLite
+        indexes.update(connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table.name},
+        ).scalars())
+    for index in table.indexes:
+        if index.name not in indexes:
+            # checkfirst also honours ddl_if, skipping the GIN indexes off Postgres
+            index.create(connection, checkfirst=True)
+    # Let creation hooks (e.g. the PostGIS GiST index) add what they would on a new table
+    table.dispatch.after_create(table, connection, checkfirst=True)
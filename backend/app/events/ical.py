@@ -0,0 +1,284 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import Club, ClubEvent
+
+GLOBAL_FEED_NAME = "Morocco Clubs Events"
+
+# Columns that appear in a VEVENT; other changes (e.g. seat counts) leave feeds alone
+ICS_FIELDS = ("club_id", "title", "description", "event_date", "location",
+              "latitude", "longitude", "status")
+
+_VEVENT_COLUMNS = (
+    ClubEvent.id,
+    ClubEvent.title,
+    ClubEvent.description,
+    ClubEvent.event_date,
+    ClubEvent.location,
+    ClubEvent.latitude,
+    ClubEvent.longitude,
+    ClubEvent.status,
+    ClubEvent.created_at,
+    ClubEvent.updated_at,
+)
+
+_UID_DOMAIN = "morocco-clubs"
+# Ids per query when rendering missing fragments
+_FETCH_BATCH = 500
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line into 75-octet chunks as RFC 5545 requires."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Never split a multi-byte UTF-8 sequence
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def render_vevent(row: Any) -> bytes:
+    """Render one event as a VEVENT block.
+
+    ``event_date`` is stored without a zone and is emitted as floating local
+    time; ``DTSTAMP`` uses the last modification time so the output, and the
+    feed ETag, only change when the event does.
+    """
+    stamp = row.updated_at or row.created_at or row.event_date
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:club-event-{row.id}@{_UID_DOMAIN}",
+        f"DTSTAMP:{_timestamp(stamp)}Z",
+        f"DTSTART:{_timestamp(row.event_date)}",
+        f"SUMMARY:{_escape(row.title)}",
+    ]
+    if row.description:
+        lines.append(f"DESCRIPTION:{_escape(row.description)}")
+    if row.location:
+        lines.append(f"LOCATION:{_escape(row.location)}")
+    if row.latitude is not None and row.longitude is not None:
+        lines.append(f"GEO:{row.latitude:.6f};{row.longitude:.6f}")
+    lines.append("STATUS:CANCELLED" if row.status == "cancelled" else "STATUS:CONFIRMED")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines).encode()
+
+
+def _calendar(name: str, fragments: Iterable[bytes]) -> bytes:
+    head = (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//Morocco Clubs//Club Events//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:PUBLISH\r\n"
+        + _fold(f"X-WR-CALNAME:{_escape(name)}")
+    )
+    return head.encode() + b"".join(fragments) + b"END:VCALENDAR\r\n"
+
+
+class ICalFeeds:
+    """Per-club and global iCalendar feeds assembled from cached VEVENTs.
+
+    Each event's VEVENT is rendered once and reused until its ``updated_at``
+    changes, so rebuilding a feed only reads and renders the events that
+    changed. Built feeds are kept, with the club name they embed and their
+    ETag, until a change to one of the club's events invalidates them, or for
+    at most ``ttl`` seconds so changes made by other workers show up. A
+    cached feed is served without touching the database.
+    """
+
+    def __init__(self, ttl: float, past_days: int):
+        self.ttl = ttl
+        self.past_days = past_days
+        # event id -> (club id, updated_at, VEVENT)
+        self._fragments: Dict[int, Tuple[int, Optional[datetime], bytes]] = {}
+        self._feeds: Dict[Optional[int], Tuple[float, str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, club_id: Optional[int]) -> Optional[Tuple[str, bytes]]:
+        """Return ``(etag, body)`` for a club's feed, or the global one for ``None``.
+
+        Returns ``None`` when the club does not exist or is inactive.
+        """
+        with self._lock:
+            cached = self._feeds.get(club_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        with SessionLocal() as db:
+            if club_id is None:
+                name = GLOBAL_FEED_NAME
+            else:
+                name = db.execute(
+                    select(Club.name).where(Club.id == club_id, Club.is_active.is_(True))
+                ).scalar()
+                if name is None:
+                    return None
+            body = self._build(db, club_id, name)
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        with self._lock:
+            self._feeds[club_id] = (time.monotonic() + self.ttl, etag, body)
+        return etag, body
+
+    def invalidate(self, club_ids: Iterable[int], event_ids: Iterable[int] = ()) -> None:
+        """Drop the feeds of ``club_ids`` and the global feed."""
+        with self._lock:
+            for club_id in club_ids:
+                self._feeds.pop(club_id, None)
+            self._feeds.pop(None, None)
+            for event_id in event_ids:
+                self._fragments.pop(event_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._feeds.clear()
+            self._fragments.clear()
+
+    def _build(self, db: Session, club_id: Optional[int], name: str) -> bytes:
+        criteria = [ClubEvent.event_date >= datetime.utcnow() - timedelta(days=self.past_days)]
+        if club_id is not None:
+            criteria.append(ClubEvent.club_id == club_id)
+        stamps = db.execute(
+            select(ClubEvent.id, ClubEvent.updated_at)
+            .where(*criteria)
+            .order_by(ClubEvent.event_date, ClubEvent.id)
+        ).all()
+
+        with self._lock:
+            fragments = dict(self._fragments)
+        missing = [
+            event_id for event_id, updated_at in stamps
+            if event_id not in fragments or fragments[event_id][1] != updated_at
+        ]
+        for start in range(0, len(missing), _FETCH_BATCH):
+            rows = db.execute(
+                select(ClubEvent.club_id, *_VEVENT_COLUMNS)
+                .where(ClubEvent.id.in_(missing[start:start + _FETCH_BATCH]))
+            )
+            for row in rows:
+                fragments[row.id] = (row.club_id, row.updated_at, render_vevent(row))
+
+        current = {event_id for event_id, _ in stamps}
+        with self._lock:
+            if club_id is None:
+                # The global feed lists every current event, so anything else is stale
+                self._fragments = {event_id: fragments[event_id] for event_id in current
+                                   if event_id in fragments}
+            else:
+                # Drop this club's events that were deleted elsewhere or aged
+                # out of the window, so fragments stay bounded without a
+                # global rebuild
+                for event_id, fragment in list(self._fragments.items()):
+                    if fragment[0] == club_id and event_id not in current:
+                        del self._fragments[event_id]
+                self._fragments.update((event_id, fragments[event_id]) for event_id in missing
+                                       if event_id in fragments)
+        return _calendar(name, (fragments[event_id][2] for event_id, _ in stamps
+                                if event_id in fragments))
+
+
+ical_feeds = ICalFeeds(ttl=settings.ical_cache_ttl_seconds, past_days=settings.ical_past_days)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag`` (weak comparison)."""
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def calendar_response(request: Request, etag: str, body: bytes) -> Response:
+    """Serve an iCalendar feed, answering 304 when the client's copy is current."""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={int(settings.ical_cache_ttl_seconds)}",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/calendar", headers=headers)
+
+
+def _record(target, club_ids: Iterable[int], event_id: Optional[int] = None) -> None:
+    session = object_session(target)
+    if session is None:
+        return
+    changed_clubs, changed_events = session.info.setdefault("ical_changes", (set(), set()))
+    changed_clubs.update(c for c in club_ids if c is not None)
+    if event_id is not None:
+        changed_events.add(event_id)
+
+
+def _club_ids(target) -> Tuple[int, ...]:
+    history = inspect(target).attrs.club_id.history
+    return (*history.deleted, *history.unchanged, *history.added)
+
+
+@event.listens_for(ClubEvent, "after_insert")
+@event.listens_for(ClubEvent, "after_update")
+def _track_event_change(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in ICS_FIELDS):
+        _record(target, _club_ids(target), target.id)
+
+
+@event.listens_for(ClubEvent, "after_delete")
+def _track_event_delete(mapper, connection, target):
+    _record(target, _club_ids(target), target.id)
+
+
+@event.listens_for(Club, "after_update")
+def _track_club_change(mapper, connection, target):
+    # Cached feeds embed the name and are only served for active clubs
+    state = inspect(target)
+    if state.attrs.name.history.has_changes() or state.attrs.is_active.history.has_changes():
+        _record(target, (target.id,))
+
+
+@event.listens_for(Club, "after_delete")
+def _track_club_delete(mapper, connection, target):
+    _record(target, (target.id,))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_feeds(session):
+    changes = session.info.pop("ical_changes", None)
+    if changes:
+        ical_feeds.invalidate(*changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_feed_changes(session):
+    session.info.pop("ical_changes", None)
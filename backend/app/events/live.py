@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from ..config import settings
+from ..models import ClubEvent
+
+logger = logging.getLogger(__name__)
+
+# Columns whose changes are pushed to live subscribers
+LIVE_FIELDS = ("current_participants", "max_participants", "status")
+
+
+def capacity_payload(club_event: Any) -> Dict[str, Any]:
+    """Build the message pushed for one event from a model or row."""
+    max_participants = club_event.max_participants
+    current = club_event.current_participants or 0
+    return {
+        "id": club_event.id,
+        "club_id": club_event.club_id,
+        "current_participants": current,
+        "max_participants": max_participants,
+        "seats_left": max(max_participants - current, 0) if max_participants is not None else None,
+        "status": club_event.status,
+    }
+
+
+class Subscription:
+    """Pending updates for one subscriber, coalesced per event id.
+
+    A slow reader never loses the latest state of an event: newer updates
+    replace older ones instead of queueing behind them. If more than
+    ``max_pending`` distinct events pile up unread, they are dropped and the
+    next read reports a resync instead, telling the client to refetch.
+    """
+
+    def __init__(self, event_ids: Optional[FrozenSet[int]], max_pending: int):
+        self.event_ids = event_ids
+        self.max_pending = max_pending
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._resync = False
+        self._ready = asyncio.Event()
+
+    def offer(self, batch: List[Dict[str, Any]]) -> None:
+        for payload in batch:
+            if self.event_ids is None or payload["id"] in self.event_ids:
+                self._pending[payload["id"]] = payload
+        if len(self._pending) > self.max_pending:
+            self._pending.clear()
+            self._resync = True
+        if self._pending or self._resync:
+            self._ready.set()
+
+    async def get(self) -> Optional[List[Dict[str, Any]]]:
+        """Wait for updates. Returns ``None`` when the client must resync."""
+        await self._ready.wait()
+        self._ready.clear()
+        if self._resync:
+            self._resync = False
+            return None
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+
+class EventBroadcaster:
+    """Fan event capacity changes out to SSE subscribers in this worker.
+
+    Changes are coalesced per event id and flushed every ``interval``
+    seconds, so a burst of registrations costs each subscriber at most one
+    message per event per interval. With ``redis_url`` set, each worker
+    publishes its flushed changes on a Redis channel and relays what it
+    receives from that channel, its own messages included, to local
+    subscribers.
+    """
+
+    def __init__(self, redis_url: str = "", channel: str = "events:capacity",
+                 interval: float = 1.0, queue_size: int = 100, redis=None):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.interval = interval
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._outbox: Dict[int, Dict[str, Any]] = {}
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._redis = redis
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self.redis_url)
+        if self._redis is not None:
+            self._tasks.append(asyncio.create_task(self._listen()))
+        self._tasks.append(asyncio.create_task(self._flush_forever()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._loop = None
+
+    def notify(self, payload: Dict[str, Any]) -> None:
+        """Queue a change for broadcast. Safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._outbox.__setitem__, payload["id"], payload)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, event_ids: Optional[FrozenSet[int]] = None) -> AsyncIterator[Subscription]:
+        subscriber = Subscription(event_ids, self.queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._flush()
+            except Exception:
+                logger.exception("Failed to flush live event updates")
+
+    async def _flush(self) -> None:
+        outbox, self._outbox = self._outbox, {}
+        if outbox:
+            if self._redis is not None:
+                try:
+                    await self._redis.publish(self.channel, json.dumps(list(outbox.values())))
+                except Exception as exc:
+                    logger.warning("Redis publish failed, delivering locally only: %s", exc)
+                    self._pending.update(outbox)
+            else:
+                self._pending.update(outbox)
+
+        if not self._pending:
+            return
+        batch = list(self._pending.values())
+        self._pending = {}
+        for subscriber in list(self._subscribers):
+            subscriber.offer(batch)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        for payload in json.loads(message["data"]):
+                            self._pending[payload["id"]] = payload
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Redis subscription lost, retrying: %s", exc)
+                await asyncio.sleep(self.interval)
+
+
+broadcaster = EventBroadcaster(
+    redis_url=settings.live_updates_redis_url,
+    interval=settings.live_updates_interval_seconds,
+    queue_size=settings.live_updates_queue_size,
+)
+
+
+@event.listens_for(ClubEvent, "after_insert")
+@event.listens_for(ClubEvent, "after_update")
+def _track_capacity_change(mapper, connection, target):
+    state = inspect(target)
+    if state.persistent and not any(state.attrs[f].history.has_changes() for f in LIVE_FIELDS):
+        return
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("live_events", {})[target.id] = capacity_payload(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_capacity_changes(session):
+    for payload in session.info.pop("live_events", {}).values():
+        broadcaster.notify(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_capacity_changes(session):
+    session.info.pop("live_events", None)
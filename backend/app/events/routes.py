@@ -0,0 +1,231 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    column,
+    delete,
+    insert,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..auth.utils import get_current_user
+from ..config import settings
+from ..database import get_db
+from ..geo import find_nearby
+from ..models import Club, ClubEvent, ClubMembership, EventParticipant, User
+from ..schemas import CheckInBatch, CheckInResponse, NearbyEventsResponse
+from .ical import calendar_response, ical_feeds
+from .live import broadcaster
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@router.get("/calendar.ics")
+async def get_events_calendar(request: Request) -> Response:
+    """Subscribe to every club's events as an iCalendar feed."""
+    etag, body = ical_feeds.get(None)
+    return calendar_response(request, etag, body)
+
+
+@router.get("/live")
+async def live_event_updates(
+    request: Request,
+    event_id: Optional[List[int]] = Query(None),
+) -> StreamingResponse:
+    """Stream seat and status changes for events as Server-Sent Events.
+
+    Pass ``event_id`` one or more times to follow specific events, or omit
+    it to receive changes for every event. A ``resync`` event means updates
+    were dropped and the client should reload current state.
+    """
+    event_ids = frozenset(event_id) if event_id else None
+
+    async def stream():
+        async with broadcaster.subscribe(event_ids) as subscription:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    batch = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.live_updates_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if batch is None:
+                    # Too far behind to replay; the client should refetch
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                for payload in batch:
+                    yield f"event: capacity\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/nearby", response_model=NearbyEventsResponse)
+async def get_nearby_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(settings.nearby_default_radius_km, gt=0, le=settings.nearby_max_radius_km),
+    limit: int = Query(20, ge=1, le=settings.nearby_max_results),
+    upcoming_only: bool = True,
+    db: Session = Depends(get_db),
+) -> Any:
+    """Get events within ``radius_km`` of a point, nearest first."""
+    criteria = []
+    if upcoming_only:
+        criteria = [ClubEvent.status == "upcoming", ClubEvent.event_date >= datetime.utcnow()]
+    events = find_nearby(
+        db,
+        ClubEvent,
+        (ClubEvent.id, ClubEvent.club_id, ClubEvent.title, ClubEvent.event_date,
+         ClubEvent.location, ClubEvent.status, ClubEvent.max_participants,
+         ClubEvent.current_participants, ClubEvent.latitude, ClubEvent.longitude),
+        lat, lon, radius_km, limit,
+        *criteria,
+    )
+    return {"events": events, "total": len(events)}
+
+
+def _check_event_managers(db: Session, event_ids: List[int], user: User) -> None:
+    """Allow site admins, and otherwise the events' creators and club managers."""
+    if user.is_admin:
+        return
+    rows = db.execute(
+        select(ClubEvent.id, ClubEvent.club_id, ClubEvent.created_by, Club.owner_id)
+        .join(Club, Club.id == ClubEvent.club_id)
+        .where(ClubEvent.id.in_(event_ids))
+    ).all()
+    pending = {row.club_id for row in rows if user.id not in (row.created_by, row.owner_id)}
+    if pending:
+        pending -= set(db.execute(
+            select(ClubMembership.club_id).where(
+                ClubMembership.club_id.in_(pending),
+                ClubMembership.user_id == user.id,
+                ClubMembership.role == "admin",
+                ClubMembership.is_active.is_(True),
+            )
+        ).scalars())
+    if pending:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+
+# Scans staged for one check-in batch on dialects without aliased VALUES
+# lists; temporary, so each connection has its own
+_check_in_scans = Table(
+    "check_in_scans",
+    MetaData(),
+    Column("event_id", Integer, nullable=False),
+    Column("user_id", String, nullable=False),
+    Column("scanned_at", DateTime, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _check_in(db: Session, scans: Dict[Tuple[int, str], datetime]) -> Set[Tuple[int, str]]:
+    """Mark every scanned participant as attended in one UPDATE joined against the scans.
+
+    Postgres joins against a ``VALUES`` list. Other databases cannot alias
+    one, so the scans are bulk-inserted into a temporary table first; either
+    way each scan is one index lookup. The earliest check-in time is kept,
+    so resubmitting a batch changes nothing. Returns the matched
+    ``(event_id, user_id)`` pairs.
+    """
+    data = [(event_id, user_id, at) for (event_id, user_id), at in scans.items()]
+    if db.get_bind().dialect.name == "postgresql":
+        rows = values(
+            column("event_id", Integer),
+            column("user_id", String),
+            column("scanned_at", DateTime),
+            name="scans",
+        ).data(data)
+    else:
+        connection = db.connection()
+        _check_in_scans.create(connection, checkfirst=True)
+        connection.execute(delete(_check_in_scans))
+        connection.execute(insert(_check_in_scans), [
+            {"event_id": event_id, "user_id": user_id, "scanned_at": at}
+            for event_id, user_id, at in data
+        ])
+        rows = _check_in_scans
+
+    statement = (
+        update(EventParticipant)
+        .where(EventParticipant.event_id == rows.c.event_id, EventParticipant.user_id == rows.c.user_id)
+        .values(
+            attended=True,
+            checked_in_at=case(
+                (or_(EventParticipant.checked_in_at.is_(None), EventParticipant.checked_in_at > rows.c.scanned_at),
+                 rows.c.scanned_at),
+                else_=EventParticipant.checked_in_at,
+            ),
+        )
+        .returning(EventParticipant.event_id, EventParticipant.user_id)
+    )
+    return set(map(tuple, db.execute(statement, execution_options={"synchronize_session": False}).all()))
+
+
+@router.post("/check-in", response_model=CheckInResponse)
+async def check_in_participants(
+    batch: CheckInBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Mark a batch of scanned participants as attended.
+
+    Scanners that were offline can send everything they collected at once;
+    repeated scans and resubmitted batches are harmless. Scans that match
+    no registered participant are returned as unknown.
+    """
+    if len(batch.scans) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch exceeds {settings.bulk_max_items} items",
+        )
+    if not batch.scans:
+        return {"checked_in": 0, "duplicates": 0, "unknown": []}
+
+    # Earliest scan per participant, stored as naive UTC like other timestamps
+    scans: Dict[Tuple[int, str], datetime] = {}
+    for scan in batch.scans:
+        at = scan.scanned_at
+        if at.tzinfo is not None:
+            at = at.astimezone(timezone.utc).replace(tzinfo=None)
+        key = (scan.event_id, scan.user_id)
+        if key not in scans or at < scans[key]:
+            scans[key] = at
+
+    _check_event_managers(db, list({event_id for event_id, _ in scans}), current_user)
+    matched = _check_in(db, scans)
+    db.commit()
+
+    unknown = [
+        {"event_id": event_id, "user_id": user_id, "scanned_at": at}
+        for (event_id, user_id), at in scans.items()
+        if (event_id, user_id) not in matched
+    ]
+    return {
+        "checked_in": len(matched),
+        "duplicates": len(batch.scans) - len(scans),
+        "unknown": unknown,
+    }
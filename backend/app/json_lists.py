@@ -0,0 +1,121 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, delete, distinct, event, func, insert, inspect, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection, Engine
+
+from .models import (
+    Club,
+    ClubApplication,
+    NewsArticle,
+    club_application_interests,
+    club_features,
+    news_article_tags,
+)
+
+logger = logging.getLogger(__name__)
+
+# model -> (list attribute, side table, owner column name)
+SIDE_TABLES: Dict[type, Tuple[str, Table, str]] = {
+    Club: ("features", club_features, "club_id"),
+    NewsArticle: ("tags", news_article_tags, "article_id"),
+    ClubApplication: ("interests", club_application_interests, "application_id"),
+}
+
+
+def uses_side_tables(bind) -> bool:
+    """Whether list containment is served by side tables rather than JSONB/GIN."""
+    return bind.dialect.name != "postgresql"
+
+
+def parse_values(raw: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter into distinct non-empty values."""
+    if not raw:
+        return []
+    return list(dict.fromkeys(v.strip() for v in raw.split(",") if v.strip()))
+
+
+def contains_all(model, values: Sequence[str], bind):
+    """Filter rows whose JSON list contains every one of ``values``.
+
+    On Postgres this is JSONB ``@>`` served by the GIN index; elsewhere it is
+    a grouped lookup on the side table's ``(value, owner)`` index.
+    """
+    attr, table, owner = SIDE_TABLES[model]
+    if not uses_side_tables(bind):
+        # The column type is a JSON variant, whose comparator knows no @>;
+        # coerce so the JSONB containment operator (and the GIN index) is used
+        return type_coerce(getattr(model, attr), JSONB).contains(list(values))
+    owner_column = table.c[owner]
+    return model.id.in_(
+        select(owner_column)
+        .where(table.c.value.in_(values))
+        .group_by(owner_column)
+        .having(func.count(distinct(table.c.value)) == len(set(values)))
+    )
+
+
+def _values(items: Any) -> List[str]:
+    if not isinstance(items, list):
+        return []
+    return list(dict.fromkeys(v for v in items if isinstance(v, str) and v))
+
+
+def sync_rows(connection: Connection, model, rows: Iterable[Tuple[int, Any]]) -> None:
+    """Replace the side table rows for ``(owner_id, list_value)`` pairs."""
+    if not uses_side_tables(connection):
+        return
+    _, table, owner = SIDE_TABLES[model]
+    rows = list(rows)
+    if not rows:
+        return
+    connection.execute(delete(table).where(table.c[owner].in_([owner_id for owner_id, _ in rows])))
+    values = [
+        {owner: owner_id, "value": value}
+        for owner_id, items in rows
+        for value in _values(items)
+    ]
+    if values:
+        connection.execute(insert(table), values)
+
+
+def delete_rows(connection: Connection, model, owner_ids: Sequence[int]) -> None:
+    """Drop side table rows for deleted owners (SQLite does not cascade by default)."""
+    if not uses_side_tables(connection):
+        return
+    _, table, owner = SIDE_TABLES[model]
+    connection.execute(delete(table).where(table.c[owner].in_(owner_ids)))
+
+
+def backfill(engine: Engine) -> None:
+    """Populate empty side tables from existing rows, e.g. after an upgrade."""
+    if not uses_side_tables(engine):
+        return
+    with engine.begin() as connection:
+        for model, (attr, table, _) in SIDE_TABLES.items():
+            if connection.execute(select(table).limit(1)).first() is not None:
+                continue
+            column = getattr(model, attr)
+            rows = connection.execute(select(model.id, column).where(column.isnot(None))).all()
+            if rows:
+                sync_rows(connection, model, rows)
+                logger.info("Backfilled %s with %d rows", table.name, len(rows))
+
+
+def _after_write(mapper, connection, target):
+    if not uses_side_tables(connection):
+        return
+    attr = SIDE_TABLES[mapper.class_][0]
+    if inspect(target).attrs[attr].history.has_changes():
+        sync_rows(connection, mapper.class_, [(target.id, getattr(target, attr))])
+
+
+def _after_delete(mapper, connection, target):
+    delete_rows(connection, mapper.class_, [target.id])
+
+
+for _model in SIDE_TABLES:
+    event.listen(_model, "after_insert", _after_write)
+    event.listen(_model, "after_update", _after_write)
+    event.listen(_model, "after_delete", _after_delete)
@@ -1,18 +1,37 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from typing import Optional
 import os
 
+from .concurrency import ConcurrencyLimitMiddleware, limits
 from .config import settings
-from .database import create_tables, engine, get_db
+from .database import (
+    SessionLocal,
+    SessionReleaseMiddleware,
+    create_tables,
+    engine,
+    pool_status,
+    replicas,
+)
 from .models import Club, ClubEvent, User
+from .admin.routes import router as admin_router
+from .applications.routes import router as applications_router
 from .auth.routes import router as auth_router
+from .clubs.recommend import recommender
+from .clubs.routes import router as clubs_router
+from .clubs.utils import clubs_cache, load_club_list
+from .content.routes import content_router, router as news_router
+from .content.utils import landing_cache, load_landing_sections
+from .events.live import broadcaster
+from .events.routes import router as events_router
+from .json_lists import backfill, parse_values
+from .media.routes import router as media_router
 
 def seed_database():
     """Add initial seed data to database."""
-    from .database import SessionLocal
     db = SessionLocal()
+    db.info["use_primary"] = True
     try:
         # Check if clubs already exist
         if db.query(Club).count() == 0:
@@ -21,6 +40,8 @@ def seed_database():
                     name="Atlas Hikers Club",
                     description="Mountain trekking and hiking adventures",
                     location="Atlas Mountains",
+                    latitude=31.0587,
+                    longitude=-7.9158,
                     member_count=250,
                     rating=5,
                     image="/images/atlas-hikers.jpg",
@@ -31,6 +52,8 @@ def seed_database():
                     name="Desert Explorers",
                     description="Sahara expeditions and desert camping",
                     location="Sahara Desert",
+                    latitude=31.0802,
+                    longitude=-4.0134,
                     member_count=180,
                     rating=5,
                     image="/images/desert-explorers.jpg",
@@ -41,6 +64,8 @@ def seed_database():
                     name="Coastal Adventures",
                     description="Beach activities and water sports",
                     location="Atlantic Coast",
+                    latitude=31.5085,
+                    longitude=-9.7595,
                     member_count=320,
                     rating=4,
                     image="/images/coastal-adventures.jpg",
@@ -63,6 +88,9 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+# Shed load before it queues up in the threadpool and connection pool
+app.add_middleware(ConcurrencyLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -72,41 +100,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Return pooled connections when the response starts, not after it is sent
+app.add_middleware(SessionReleaseMiddleware)
+
+# Opt-in request profiling; not installed at all unless enabled
+if settings.profiling_enabled:
+    from .profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    backfill(engine)
+    os.makedirs(settings.upload_path, exist_ok=True)
     seed_database()
+    with SessionLocal() as db:
+        recommender.load(db)
+    await replicas.start()
+    await broadcaster.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await broadcaster.stop()
+    await replicas.stop()
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "message": "Morocco Clubs API is running"}
 
+@app.get("/health/live")
+async def liveness_check():
+    """The process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """Ready while the connection pool has spare capacity."""
+    database = pool_status(engine)
+    if not database["ready"]:
+        response.status_code = 503
+    return {
+        "status": "ok" if database["ready"] else "unavailable",
+        "database": database,
+        "replicas": replicas.status(),
+        "concurrency": {name: limit.status() for name, limit in limits.items()},
+    }
+
 # Include auth routes
 app.include_router(auth_router, prefix="/api")
 
+# Include news and site content routes
+app.include_router(news_router, prefix="/api")
+app.include_router(content_router, prefix="/api")
+
+# Include admin routes
+app.include_router(admin_router, prefix="/api")
+
+# Include club and event routes
+app.include_router(clubs_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
+
+# Include application routes
+app.include_router(applications_router, prefix="/api")
+
+# Include media routes; uploaded blobs are served from /uploads
+app.include_router(media_router, prefix="/api")
+app.mount("/uploads", StaticFiles(directory=settings.upload_path, check_dir=False), name="uploads")
+
 # Clubs routes
 @app.get("/api/clubs")
-async def get_clubs(db: Session = Depends(get_db)):
+async def get_clubs(
+    features: Optional[str] = Query(None, description="Comma-separated features, all required"),
+):
     """Get all clubs from database."""
-    clubs = db.query(Club).filter(Club.is_active == True).all()
-    return {
-        "clubs": [{
-            "id": club.id,
-            "name": club.name,
-            "description": club.description,
-            "location": club.location,
-            "member_count": club.member_count,
-            "rating": club.rating,
-            "image": club.image,
-            "features": club.features,
-            "is_active": club.is_active,
-            "created_at": club.created_at.isoformat() if club.created_at else None,
-            "updated_at": club.updated_at.isoformat() if club.updated_at else None
-        } for club in clubs],
-        "total": len(clubs)
-    }
+    key = tuple(sorted(parse_values(features)))
+    body = await clubs_cache.get(key, lambda: load_club_list(key))
+    return Response(content=body, media_type="application/json")
 
 # Events routes
 @app.get("/api/events")
@@ -142,154 +213,11 @@ async def get_events():
         "total": 2
     }
 
-# Applications routes
-@app.post("/api/applications")
-async def submit_application(application_data: dict):
-    """Submit membership application - temporary implementation."""
-    return {
-        "id": 1,
-        "status": "submitted",
-        "message": "Application submitted successfully! We'll review your application and get back to you soon.",
-        "created_at": "2024-01-01T00:00:00Z"
-    }
-
-@app.get("/api/applications")
-async def get_applications():
-    """Get applications for admin review - temporary implementation."""
-    return {
-        "applications": [
-            {
-                "id": 1,
-                "applicant_name": "Ahmed El-Mansouri",
-                "email": "ahmed@example.com",
-                "phone": "+212-6-12-34-56-78",
-                "preferred_club": "Atlas Hikers Club",
-                "interests": ["Hiking", "Photography", "Nature"],
-                "motivation": "I'm passionate about exploring Morocco's beautiful mountains...",
-                "status": "submitted",
-                "created_at": "2024-01-01T00:00:00Z"
-            },
-            {
-                "id": 2,
-                "applicant_name": "Fatima Zahra",
-                "email": "fatima@example.com",
-                "phone": "+212-6-98-76-54-32",
-                "preferred_club": "Desert Explorers",
-                "interests": ["Desert Adventures", "Camping", "Culture"],
-                "motivation": "I want to discover the magic of the Sahara Desert...",
-                "status": "under_review",
-                "created_at": "2024-01-02T00:00:00Z"
-            }
-        ],
-        "total": 2
-    }
-
 # Content Management routes
 @app.get("/api/content/landing")
 async def get_landing_sections():
-    """Get landing page sections - temporary implementation."""
-    return {
-        "sections": [
-            {
-                "id": 1,
-                "key": "hero",
-                "type": "hero",
-                "title": "Discover Morocco's Adventure Clubs",
-                "subtitle": "Join passionate communities exploring the Kingdom's wonders",
-                "data": {
-                    "backgroundImage": "/images/hero-bg.jpg",
-                    "ctaText": "Explore Clubs",
-                    "ctaLink": "/clubs"
-                },
-                "is_visible": True,
-                "order": 1
-            },
-            {
-                "id": 2,
-                "key": "activities",
-                "type": "activities",
-                "title": "Popular Activities",
-                "subtitle": "Discover amazing adventures across Morocco",
-                "data": {
-                    "activities": [
-                        {
-                            "name": "Mountain Hiking",
-                            "description": "Explore the Atlas Mountains",
-                            "image": "/images/hiking.jpg",
-                            "difficulty": "Moderate"
-                        },
-                        {
-                            "name": "Desert Camping",
-                            "description": "Sleep under Sahara stars",
-                            "image": "/images/camping.jpg",
-                            "difficulty": "Easy"
-                        }
-                    ]
-                },
-                "is_visible": True,
-                "order": 2
-            }
-        ]
-    }
-
-@app.get("/api/content/join-config")
-async def get_join_config():
-    """Get Join Us form configuration - temporary implementation."""
-    return {
-        "id": 1,
-        "page_title": "Join Our Adventure Community",
-        "page_subtitle": "Ready to explore Morocco's wonders with like-minded adventurers?",
-        "sections": {
-            "personalInfo": {
-                "isEnabled": True,
-                "title": "Personal Information",
-                "description": "Basic details about yourself",
-                "icon": "User",
-                "order": 1
-            },
-            "clubPreferences": {
-                "isEnabled": True,
-                "title": "Club Preferences",
-                "description": "Choose your preferred club",
-                "icon": "MapPin",
-                "order": 2
-            },
-            "interests": {
-                "isEnabled": True,
-                "title": "Your Interests",
-                "description": "Select your favorite activities",
-                "icon": "Heart",
-                "order": 3
-            },
-            "motivation": {
-                "isEnabled": True,
-                "title": "Tell Us About Yourself",
-                "description": "Share your motivation",
-                "icon": "FileText",
-                "order": 4
-            }
-        },
-        "available_clubs": [
-            {
-                "id": "atlas-hikers",
-                "name": "Atlas Hikers Club",
-                "description": "Mountain trekking adventures",
-                "members": "250+ Members",
-                "isActive": True
-            },
-            {
-                "id": "desert-explorers",
-                "name": "Desert Explorers",
-                "description": "Sahara expeditions",
-                "members": "180+ Members",
-                "isActive": True
-            }
-        ],
-        "available_interests": [
-            "Hiking", "Camping", "Photography", "Desert Tours", 
-            "Beach Activities", "Cultural Tours", "Adventure Sports"
-        ]
-    }
+    """Get visible landing page sections."""
+    return await landing_cache.get("landing", load_landing_sections)
 
 # Analytics routes (admin only)
 @app.get("/api/analytics/dashboard")
@@ -0,0 +1,142 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Optional
+
+from ..auth.utils import get_current_user
+from ..config import settings
+from ..database import get_db
+from ..models import Club, ClubGallery, ClubMembership, User
+from ..schemas import ClubGalleryImageResponse
+from .storage import (
+    EXTENSIONS,
+    UploadTooLarge,
+    acquire,
+    add_reference,
+    blob_url,
+    discard,
+    publish,
+    release,
+    spool,
+)
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+def _check_club_manager(db: Session, club_id: int, user: User) -> None:
+    """Allow site admins, the club owner and club admins."""
+    owner_id = db.execute(select(Club.owner_id).where(Club.id == club_id)).first()
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Club not found",
+        )
+    if user.is_admin or owner_id[0] == user.id:
+        return
+    is_club_admin = db.execute(
+        select(ClubMembership.id).where(
+            ClubMembership.club_id == club_id,
+            ClubMembership.user_id == user.id,
+            ClubMembership.role == "admin",
+            ClubMembership.is_active.is_(True),
+        )
+    ).first()
+    if is_club_admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+
+@router.post(
+    "/clubs/{club_id}/gallery",
+    response_model=ClubGalleryImageResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_gallery_image(
+    club_id: int,
+    file: Optional[UploadFile] = File(None),
+    digest: Optional[str] = Form(None, min_length=64, max_length=64),
+    caption: Optional[str] = Form(None, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Add an image to a club gallery.
+
+    Send the image as ``file``, or only its SHA-256 ``digest`` to reuse a
+    file that was already uploaded.
+    """
+    _check_club_manager(db, club_id, current_user)
+
+    tmp = None
+    if file is not None:
+        if file.content_type not in settings.allowed_file_types or file.content_type not in EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported file type: {file.content_type}",
+            )
+        try:
+            digest, size, tmp = await run_in_threadpool(spool, file.file, settings.max_upload_size)
+        except UploadTooLarge:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds {settings.max_upload_size} bytes",
+            )
+        extension = EXTENSIONS[file.content_type]
+    elif digest:
+        digest = digest.lower()
+        extension = add_reference(db, digest)
+        if extension is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Unknown digest, upload the file instead",
+            )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Provide a file or a digest",
+        )
+
+    try:
+        if tmp is not None:
+            extension = acquire(db, digest, size, file.content_type, extension)
+        image = ClubGallery(
+            club_id=club_id,
+            image_url=blob_url(digest, extension),
+            blob_digest=digest,
+            caption=caption,
+            uploaded_by=current_user.id,
+        )
+        db.add(image)
+        db.commit()
+    except Exception:
+        db.rollback()
+        if tmp is not None:
+            discard(tmp)
+        raise
+    if tmp is not None:
+        # Only after the reference is committed, so a sweep can't remove the file
+        await run_in_threadpool(publish, tmp, digest, extension)
+    db.refresh(image)
+    return image
+
+
+@router.delete("/gallery/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_gallery_image(
+    image_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    """Remove an image from a club gallery."""
+    image = db.get(ClubGallery, image_id)
+    if image is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found",
+        )
+    _check_club_manager(db, image.club_id, current_user)
+    if image.blob_digest:
+        release(db, image.blob_digest)
+    db.delete(image)
+    db.commit()
@@ -0,0 +1,178 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+from datetime import timedelta
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import MediaBlob
+
+CHUNK_SIZE = 64 * 1024
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def blob_key(digest: str, extension: str) -> str:
+    """Path of a blob relative to ``upload_path``, fanned out by digest prefix."""
+    return f"blobs/{digest[:2]}/{digest}{extension}"
+
+
+def blob_path(digest: str, extension: str) -> str:
+    return os.path.join(settings.upload_path, blob_key(digest, extension))
+
+
+def blob_url(digest: str, extension: str) -> str:
+    return f"/uploads/{blob_key(digest, extension)}"
+
+
+def _tmp_dir() -> str:
+    path = os.path.join(settings.upload_path, "tmp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def spool(source: BinaryIO, max_size: int) -> Tuple[str, int, str]:
+    """Copy an upload to a temporary file, hashing it on the way.
+
+    Returns ``(sha256 hex digest, size, temporary path)``. The temporary file
+    lives on the same filesystem as the blob store so :func:`publish` can
+    move it into place atomically.
+    """
+    fd, tmp = tempfile.mkstemp(dir=_tmp_dir())
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(max_size)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        discard(tmp)
+        raise
+    return digest.hexdigest(), size, tmp
+
+
+def publish(tmp: str, digest: str, extension: str) -> None:
+    """Move a spooled upload into the blob store unless it is already there."""
+    path = blob_path(digest, extension)
+    if os.path.exists(path):
+        discard(tmp)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp, path)
+
+
+def discard(tmp: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(tmp)
+
+
+def acquire(db: Session, digest: str, size: int, content_type: str, extension: str) -> str:
+    """Add a reference to a blob, creating its row on first upload.
+
+    Returns the blob's stored extension, which is the first upload's even
+    when the same bytes arrive again under another content type.
+    """
+    stored = add_reference(db, digest)
+    if stored is not None:
+        return stored
+    try:
+        with db.begin_nested():
+            db.execute(insert(MediaBlob).values(
+                digest=digest,
+                size=size,
+                content_type=content_type,
+                extension=extension,
+                ref_count=1,
+            ))
+    except IntegrityError:
+        # Another upload of the same file created the row first
+        return add_reference(db, digest)
+    return extension
+
+
+def add_reference(db: Session, digest: str) -> Optional[str]:
+    """Increment a blob's reference count. Returns its extension, or ``None`` if unknown.
+
+    The UPDATE locks the row, so it cannot race a garbage collection sweep
+    deleting the same blob.
+    """
+    return db.execute(
+        update(MediaBlob)
+        .where(MediaBlob.digest == digest)
+        .values(ref_count=MediaBlob.ref_count + 1)
+        .returning(MediaBlob.extension),
+        execution_options={"synchronize_session": False},
+    ).scalar()
+
+
+def release(db: Session, digest: str) -> None:
+    """Drop a reference; unreferenced blobs are reclaimed by :func:`collect_garbage`."""
+    db.execute(
+        update(MediaBlob)
+        .where(MediaBlob.digest == digest)
+        .values(ref_count=MediaBlob.ref_count - 1),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def collect_garbage(db: Session, grace_seconds: float, batch_size: int = 500) -> Dict[str, int]:
+    """Delete blobs that have been unreferenced for at least ``grace_seconds``.
+
+    Each blob's row is deleted, its file unlinked and the transaction
+    committed in turn, so a concurrent upload of the same content either
+    re-references the row first or waits and recreates it afterwards.
+    Temporary files left behind by interrupted uploads are removed too.
+    """
+    cutoff = db.execute(select(func.now())).scalar() - timedelta(seconds=grace_seconds)
+    deleted = freed = 0
+    while True:
+        digests = db.execute(
+            select(MediaBlob.digest)
+            .where(MediaBlob.ref_count <= 0, MediaBlob.updated_at < cutoff)
+            .limit(batch_size)
+        ).scalars().all()
+        if not digests:
+            break
+        for digest in digests:
+            row = db.execute(
+                delete(MediaBlob)
+                .where(MediaBlob.digest == digest, MediaBlob.ref_count <= 0)
+                .returning(MediaBlob.size, MediaBlob.extension)
+            ).first()
+            if row is not None:
+                discard(blob_path(digest, row.extension))
+                deleted += 1
+                freed += row.size
+            db.commit()
+        if len(digests) < batch_size:
+            break
+
+    tmp_dir = _tmp_dir()
+    expired = time.time() - grace_seconds
+    for name in os.listdir(tmp_dir):
+        path = os.path.join(tmp_dir, name)
+        with contextlib.suppress(FileNotFoundError):
+            if os.path.getmtime(path) < expired:
+                os.unlink(path)
+    return {"deleted": deleted, "freed_bytes": freed}
@@ -1,12 +1,29 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Float, Index, Table
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from .database import Base
 
+# JSON string lists that are filtered by containment: JSONB with a GIN index
+# on Postgres, mirrored into normalized side tables on other backends.
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
+# NULL timestamps sort as the epoch, i.e. last when listing newest first
+EPOCH = datetime(1970, 1, 1)
+
+
+def sort_time(column):
+    """``column`` with NULLs replaced by :data:`EPOCH`, for ordering and keyset cursors.
+
+    The epoch is a SQL literal rather than a bind so queries match indexes
+    built on the same expression.
+    """
+    return func.coalesce(column, literal_column(f"'{EPOCH:%Y-%m-%d %H:%M:%S}'"))
+
 
 class User(Base):
     """User model matching the existing schema."""
@@ -44,8 +61,11 @@ class Club(Base):
     long_description = Column(Text)
     image = Column(String(500))
     location = Column(String(255), nullable=False, index=True)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
     member_count = Column(Integer, default=0)
-    features = Column(JSON, default=list)
+    features = Column(JSONList, default=list)
     contact_phone = Column(String)
     contact_email = Column(String)
     website = Column(String)
@@ -55,7 +75,11 @@ class Club(Base):
     is_active = Column(Boolean, default=True)
     owner_id = Column(String, ForeignKey("users.id"))
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
+    
+    __table_args__ = (
+        Index("ix_clubs_features_gin", "features", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     # Relationships
     owner = relationship("User", back_populates="owned_clubs")
@@ -91,6 +115,9 @@ class ClubEvent(Base):
     description = Column(Text)
     event_date = Column(DateTime, nullable=False)
     location = Column(String(255))
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
     max_participants = Column(Integer)
     current_participants = Column(Integer, default=0)
     status = Column(String(20), default="upcoming")  # upcoming, ongoing, completed, cancelled
@@ -113,6 +140,12 @@ class EventParticipant(Base):
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     registered_at = Column(DateTime, default=func.now())
     attended = Column(Boolean, default=False)
+    checked_in_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Check-in scans look participants up by (event, user)
+        Index("ix_event_participants_event_user", "event_id", "user_id"),
+    )
     
     # Relationships
     event = relationship("ClubEvent", back_populates="participants")
@@ -126,6 +159,7 @@ class ClubGallery(Base):
     id = Column(Integer, primary_key=True, index=True)
     club_id = Column(Integer, ForeignKey("clubs.id"), nullable=False)
     image_url = Column(String(500), nullable=False)
+    blob_digest = Column(String(64), ForeignKey("media_blobs.digest"), index=True)
     caption = Column(String(255))
     uploaded_by = Column(String, ForeignKey("users.id"))
     uploaded_at = Column(DateTime, default=func.now())
@@ -135,6 +169,24 @@ class ClubGallery(Base):
     uploader = relationship("User", back_populates="uploaded_images")
 
 
+class MediaBlob(Base):
+    """Uploaded file stored once under its SHA-256 digest."""
+    __tablename__ = "media_blobs"
+    
+    digest = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=False)
+    extension = Column(String(10), nullable=False, default="")
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Garbage collection scans for unreferenced blobs
+        Index("ix_media_blobs_unreferenced", "ref_count", "updated_at"),
+    )
+
+
 class ClubReview(Base):
     """Club review/testimonial model."""
     __tablename__ = "club_reviews"
@@ -161,7 +213,7 @@ class ClubApplication(Base):
     email = Column(String, nullable=False)
     phone = Column(String, nullable=False)
     preferred_club = Column(String)
-    interests = Column(JSON, default=list)
+    interests = Column(JSONList, default=list)
     motivation = Column(Text, nullable=False)
     answers = Column(JSON, default=dict)
     status = Column(String(20), default="submitted")  # submitted, under_review, approved, rejected
@@ -170,6 +222,12 @@ class ClubApplication(Base):
     notes = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Review queue: filter by status, newest first
+        Index("ix_club_applications_status_created", "status", sort_time(created_at), "id"),
+        Index("ix_club_applications_interests_gin", "interests", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 class LandingSection(Base):
@@ -202,13 +260,25 @@ class NewsArticle(Base):
     content = Column(Text, nullable=False)
     featured_image = Column(String)
     category = Column(String)
-    tags = Column(JSON, default=list)
+    tags = Column(JSONList, default=list)
     is_published = Column(Boolean, default=False)
     is_featured = Column(Boolean, default=False)
     author_id = Column(String, ForeignKey("users.id"))
     published_at = Column(DateTime)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Keyset feed index covering published articles only
+        Index(
+            "ix_news_articles_published_feed",
+            "published_at",
+            "id",
+            postgresql_where=(is_published.is_(True) & published_at.isnot(None)),
+            sqlite_where=(is_published.is_(True) & published_at.isnot(None)),
+        ),
+        Index("ix_news_articles_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 class JoinUsConfiguration(Base):
@@ -227,4 +297,33 @@ class JoinUsConfiguration(Base):
     terms_description = Column(Text)
     validation = Column(JSON, default=dict)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+# Side tables mirroring JSON list columns on backends without JSONB/GIN
+club_features = Table(
+    "club_features",
+    Base.metadata,
+    Column("club_id", Integer, ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True),
+    Column("value", String(255), primary_key=True),
+    Index("ix_club_features_value", "value", "club_id"),
+    info={"json_side_table": True},
+)
+
+news_article_tags = Table(
+    "news_article_tags",
+    Base.metadata,
+    Column("article_id", Integer, ForeignKey("news_articles.id", ondelete="CASCADE"), primary_key=True),
+    Column("value", String(255), primary_key=True),
+    Index("ix_news_article_tags_value", "value", "article_id"),
+    info={"json_side_table": True},
+)
+
+club_application_interests = Table(
+    "club_application_interests",
+    Base.metadata,
+    Column("application_id", Integer, ForeignKey("club_applications.id", ondelete="CASCADE"), primary_key=True),
+    Column("value", String(255), primary_key=True),
+    Index("ix_club_application_interests_value", "value", "application_id"),
+    info={"json_side_table": True},
+)
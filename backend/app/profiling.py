@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from .auth.utils import verify_token
+from .config import settings
+from .database import SessionLocal
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+# Profile ids are generated here; anything else is rejected before touching disk
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+# SQL statements of the request being profiled, if any
+_sql_log: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("profiling_sql_log", default=None)
+
+
+class StackSampler:
+    """Sample one thread's Python stack from a background thread.
+
+    Stacks are counted in collapsed form (``outer;inner count``), which
+    flamegraph.pl, speedscope and most other flamegraph tools read directly.
+    Handlers run on the event loop thread, so samples include any other
+    request interleaved with the profiled one.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_log.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _sql_log.get()
+    started = conn.info.get("profiling_started")
+    if log is not None and started:
+        log.append({
+            "statement": statement,
+            "duration_ms": round((time.perf_counter() - started.pop()) * 1000, 3),
+            "executemany": executemany,
+        })
+
+
+_listeners_lock = threading.Lock()
+_active_profiles = 0
+
+
+def _attach_sql_listeners() -> None:
+    """Listen on every engine while at least one profile is running."""
+    global _active_profiles
+    with _listeners_lock:
+        _active_profiles += 1
+        if _active_profiles == 1:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _detach_sql_listeners() -> None:
+    global _active_profiles
+    with _listeners_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _is_admin_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    user_id = verify_token(token)
+    if user_id is None:
+        return False
+    with SessionLocal() as db:
+        return bool(db.execute(select(User.is_admin).where(User.id == user_id)).scalar())
+
+
+def _write_profile(profile_id: str, collapsed: str, summary: Dict[str, Any]) -> None:
+    os.makedirs(settings.profiling_dir, exist_ok=True)
+    base = os.path.join(settings.profiling_dir, profile_id)
+    with open(base + ".folded", "w") as f:
+        f.write(collapsed)
+    with open(base + ".json", "w") as f:
+        json.dump(summary, f, indent=2)
+    # Ids sort by time, so the oldest profiles come first
+    saved = sorted(name[:-5] for name in os.listdir(settings.profiling_dir) if name.endswith(".json"))
+    for old_id in saved[:max(0, len(saved) - settings.profiling_max_files)]:
+        for kind in (".folded", ".json"):
+            try:
+                os.unlink(os.path.join(settings.profiling_dir, old_id + kind))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Summaries of saved profiles, newest first (without their SQL)."""
+    if not os.path.isdir(settings.profiling_dir):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(settings.profiling_dir), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(settings.profiling_dir, name)) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary.pop("sql", None)
+        profiles.append(summary)
+    return profiles
+
+
+def profile_path(profile_id: str, kind: str) -> Optional[str]:
+    """Path of a saved profile's ``folded`` or ``json`` file, if it exists."""
+    if not PROFILE_ID.match(profile_id) or kind not in ("folded", "json"):
+        return None
+    path = os.path.join(settings.profiling_dir, f"{profile_id}.{kind}")
+    return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    """Profile requests sent with ``X-Profile`` by an admin, or a random sample.
+
+    A profiled request gets a stack sampler on the event loop thread and SQL
+    timing listeners; the collapsed stacks and a JSON summary with every
+    statement are written to ``profiling_dir`` and the profile id is
+    returned in the ``X-Profile-Id`` response header. The middleware is only
+    installed when ``profiling_enabled`` is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _wanted(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER.encode()):
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            return await run_in_threadpool(_is_admin_token, authorization)
+        return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())],
+                }
+            await send(message)
+
+        sql: List[Dict[str, Any]] = []
+        token = _sql_log.set(sql)
+        _attach_sql_listeners()
+        sampler = StackSampler(threading.get_ident(), settings.profiling_interval_seconds)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            _detach_sql_listeners()
+            _sql_log.reset(token)
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "samples": sum(sampler.stacks.values()),
+                "sql_count": len(sql),
+                "sql_ms": round(sum(s["duration_ms"] for s in sql), 3),
+                "sql": sql,
+            }
+            try:
+                await run_in_threadpool(_write_profile, profile_id, sampler.collapsed(), summary)
+            except OSError:
+                logger.exception("Could not write profile %s", profile_id)
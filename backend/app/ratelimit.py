@@ -0,0 +1,179 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# Token bucket evaluated atomically inside Redis. Uses the server clock so
+# every worker agrees on refill timing. Returns the retry-after delay in
+# seconds as a string (Lua numbers are truncated to integers on return).
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry)
+"""
+
+
+@lru_cache(maxsize=64)
+def parse_rate(limit: str) -> Tuple[float, float]:
+    """Parse a limit such as ``"5/minute"`` into ``(capacity, tokens_per_second)``."""
+    try:
+        count, period = limit.strip().split("/", 1)
+        capacity = float(count)
+        period = period.strip().lower().rstrip("s")
+        seconds = _PERIODS[period]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit: {limit!r}")
+    if capacity <= 0:
+        raise ValueError(f"Invalid rate limit: {limit!r}")
+    return capacity, capacity / seconds
+
+
+class MemoryBackend:
+    """In-process token buckets, O(1) per check.
+
+    Buckets are kept in LRU order and the least recently used ones are
+    dropped past ``max_keys``; a dropped bucket is equivalent to a full one.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        """Consume ``cost`` tokens. Return 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        tokens, ts = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBackend:
+    """Token buckets shared by all workers, one atomic script call per check."""
+
+    def __init__(self, url: str = "", prefix: str = "ratelimit:", client=None):
+        if client is None:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(url)
+        self.prefix = prefix
+        self.client = client
+        self._script = self.client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def hit(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        result = await self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        return float(result)
+
+
+class RateLimiter:
+    """Dispatch checks to Redis when configured, else to in-process buckets.
+
+    If Redis is unreachable the check falls back to the local buckets so an
+    outage degrades to per-worker limits instead of rejecting all traffic.
+    """
+
+    def __init__(self, redis_url: str = "", max_keys: int = 100_000):
+        self.memory = MemoryBackend(max_keys=max_keys)
+        self.redis: Optional[RedisBackend] = RedisBackend(redis_url) if redis_url else None
+
+    async def hit(self, key: str, limit: str, cost: float = 1) -> float:
+        capacity, rate = parse_rate(limit)
+        if self.redis is not None:
+            try:
+                return await self.redis.hit(key, capacity, rate, cost)
+            except Exception as exc:
+                logger.warning("Redis rate limiter unavailable, using local buckets: %s", exc)
+        return await self.memory.hit(key, capacity, rate, cost)
+
+
+limiter = RateLimiter(
+    redis_url=settings.rate_limit_redis_url,
+    max_keys=settings.rate_limit_max_keys,
+)
+
+
+def client_ip(request: Request) -> str:
+    """Return the client address, honouring X-Forwarded-For when trusted."""
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """FastAPI dependency enforcing a token-bucket limit.
+
+    ``key`` selects what the bucket is keyed by: ``"ip"`` (client address),
+    ``"user"`` (bearer token subject, falling back to the IP) or ``"route"``
+    (one bucket shared by every caller of the route).
+    """
+
+    def __init__(self, scope: str, limit: str, key: str = "ip"):
+        if key not in ("ip", "user", "route"):
+            raise ValueError(f"Unknown rate limit key: {key!r}")
+        parse_rate(limit)
+        self.scope = scope
+        self.limit = limit
+        self.key = key
+
+    def _identity(self, request: Request) -> str:
+        if self.key == "route":
+            return "*"
+        if self.key == "user":
+            from .auth.utils import verify_token
+
+            auth = request.headers.get("authorization", "")
+            if auth.lower().startswith("bearer "):
+                user_id = verify_token(auth[7:])
+                if user_id:
+                    return f"user:{user_id}"
+        return f"ip:{client_ip(request)}"
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+        retry_after = await limiter.hit(f"{self.scope}:{self._identity(request)}", self.limit)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
@@ -1,13 +1,21 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List, Dict, Any, Union
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    TypeAdapter,
+    ValidationInfo,
+    field_validator,
+    validator,
+)
+from typing import Optional, List, Dict, Any, Literal, Sequence, Union
 from datetime import datetime
 from enum import Enum
 
 
 # Base schemas
 class BaseSchema(BaseModel):
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # User schemas
@@ -59,6 +67,8 @@ class ClubBase(BaseSchema):
     long_description: Optional[str] = None
     image: Optional[str] = None
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     features: List[str] = []
     contact_phone: Optional[str] = None
     contact_email: Optional[str] = None
@@ -77,6 +87,8 @@ class ClubUpdate(BaseModel):
     long_description: Optional[str] = None
     image: Optional[str] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     features: Optional[List[str]] = None
     contact_phone: Optional[str] = None
     contact_email: Optional[str] = None
@@ -88,12 +100,20 @@ class ClubUpdate(BaseModel):
 
 class ClubResponse(ClubBase):
     id: int
-    member_count: int = 0
-    rating: int = 5
-    is_active: bool = True
+    member_count: Optional[int] = 0
+    rating: Optional[int] = 5
+    is_active: Optional[bool] = True
     owner_id: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator("features", "social_media", mode="before")
+    @classmethod
+    def _empty_when_null(cls, value: Any, info: ValidationInfo) -> Any:
+        # Nullable JSON columns; clients expect a list/object either way
+        if value is None:
+            return [] if info.field_name == "features" else {}
+        return value
 
 
 # Event schemas
@@ -102,6 +122,8 @@ class ClubEventBase(BaseSchema):
     description: Optional[str] = None
     event_date: datetime
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     max_participants: Optional[int] = None
 
 
@@ -114,6 +136,8 @@ class ClubEventUpdate(BaseModel):
     description: Optional[str] = None
     event_date: Optional[datetime] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     max_participants: Optional[int] = None
     status: Optional[str] = None
 
@@ -128,6 +152,22 @@ class ClubEventResponse(ClubEventBase):
     updated_at: datetime
 
 
+class CheckInScan(BaseModel):
+    event_id: int
+    user_id: str
+    scanned_at: datetime
+
+
+class CheckInBatch(BaseModel):
+    scans: List[CheckInScan]
+
+
+class CheckInResponse(BaseModel):
+    checked_in: int
+    duplicates: int
+    unknown: List[CheckInScan]
+
+
 # Application schemas
 class ApplicationStatus(str, Enum):
     SUBMITTED = "submitted"
@@ -162,8 +202,29 @@ class ClubApplicationResponse(ClubApplicationBase):
     reviewed_by: Optional[str] = None
     reviewed_at: Optional[datetime] = None
     notes: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ClubApplicationListResponse(BaseModel):
+    applications: List[ClubApplicationResponse]
+    next_cursor: Optional[str] = None
+
+
+class ApplicationStatusCounts(BaseModel):
+    counts: Dict[ApplicationStatus, int]
+    total: int
+
+
+class ApplicationBatchReview(BaseModel):
+    ids: List[int]
+    status: Literal[ApplicationStatus.APPROVED, ApplicationStatus.REJECTED]
+    notes: Optional[str] = None
+
+
+class ApplicationBatchReviewResponse(BaseModel):
+    updated: List[int]
+    skipped: List[int]
 
 
 # Landing page schemas
@@ -236,6 +297,23 @@ class NewsArticleResponse(NewsArticleBase):
     updated_at: datetime
 
 
+class NewsArticleSummary(BaseSchema):
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    featured_image: Optional[str] = None
+    category: Optional[str] = None
+    tags: List[str] = []
+    is_featured: bool = False
+    published_at: datetime
+
+
+class NewsFeedResponse(BaseModel):
+    articles: List[NewsArticleSummary]
+    next_cursor: Optional[str] = None
+
+
 # Join Us Configuration schemas
 class JoinUsConfigBase(BaseSchema):
     page_title: str
@@ -269,6 +347,101 @@ class JoinUsConfigResponse(JoinUsConfigBase):
     updated_at: datetime
 
 
+# Nearby search schemas
+class NearbyClub(BaseSchema):
+    id: int
+    name: str
+    location: str
+    image: Optional[str] = None
+    rating: Optional[int] = None
+    member_count: Optional[int] = None
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class NearbyClubsResponse(BaseModel):
+    clubs: List[NearbyClub]
+    total: int
+
+
+class NearbyEvent(BaseSchema):
+    id: int
+    club_id: int
+    title: str
+    event_date: datetime
+    location: Optional[str] = None
+    status: Optional[str] = None
+    max_participants: Optional[int] = None
+    current_participants: Optional[int] = None
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class NearbyEventsResponse(BaseModel):
+    events: List[NearbyEvent]
+    total: int
+
+
+# Recommendation schemas
+class RecommendedClub(BaseSchema):
+    id: int
+    name: str
+    description: str
+    location: str
+    image: Optional[str] = None
+    rating: Optional[int] = None
+    member_count: Optional[int] = None
+    features: List[str] = []
+    score: float
+
+
+class RecommendedClubsResponse(BaseModel):
+    clubs: List[RecommendedClub]
+    total: int
+
+
+# Bulk admin schemas
+class ClubBulkUpdateItem(ClubUpdate):
+    id: int
+
+
+class ClubEventBulkUpdateItem(ClubEventUpdate):
+    id: int
+
+
+class ClubBulkCreate(BaseModel):
+    items: List[ClubCreate]
+
+
+class ClubBulkUpdate(BaseModel):
+    items: List[ClubBulkUpdateItem]
+
+
+class ClubEventBulkCreate(BaseModel):
+    items: List[ClubEventCreate]
+
+
+class ClubEventBulkUpdate(BaseModel):
+    items: List[ClubEventBulkUpdateItem]
+
+
+class BulkDelete(BaseModel):
+    ids: List[int]
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int
+    status: str
+
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+    total: int
+
+
 # Generic response schemas
 class MessageResponse(BaseModel):
     message: str
@@ -286,4 +459,31 @@ class FileUploadResponse(BaseModel):
     filename: str
     url: str
     size: int
-    content_type: str
\ No newline at end of file
+    content_type: str
+
+
+class ClubGalleryImageResponse(BaseSchema):
+    id: int
+    club_id: int
+    image_url: str
+    blob_digest: Optional[str] = None
+    caption: Optional[str] = None
+    uploaded_by: Optional[str] = None
+    uploaded_at: datetime
+
+
+class MediaGarbageCollectionResponse(BaseModel):
+    deleted: int
+    freed_bytes: int
+
+
+# Precompiled list adapters for bulk validation of ORM rows
+ClubListAdapter = TypeAdapter(List[ClubResponse])
+ClubEventListAdapter = TypeAdapter(List[ClubEventResponse])
+ClubApplicationListAdapter = TypeAdapter(List[ClubApplicationResponse])
+NewsArticleSummaryListAdapter = TypeAdapter(List[NewsArticleSummary])
+
+
+def dump_list_json(adapter: TypeAdapter, rows: Sequence[Any]) -> bytes:
+    """Validate ``rows`` by attribute in one pass and serialize straight to JSON bytes."""
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /api/clubs response path.
+Compares the hand-built dicts previously returned by get_clubs (encoded the
+way FastAPI encodes a plain dict) with bulk validation through the
+precompiled ClubListAdapter serialized straight to JSON bytes.
+
+Usage: python bench_schemas.py [rows] [repeats]
+"""
+
+import json
+import sys
+import timeit
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import Club
+from app.schemas import ClubListAdapter, dump_list_json
+
+
+def make_clubs(count):
+    now = datetime.utcnow()
+    return [
+        Club(
+            id=i,
+            name=f"Club {i}",
+            description="Mountain trekking and hiking adventures",
+            location="Atlas Mountains",
+            latitude=31.0587,
+            longitude=-7.9158,
+            member_count=250,
+            rating=5,
+            image="/images/atlas-hikers.jpg",
+            features=["Hiking", "Camping", "Photography"],
+            social_media={},
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def hand_built(clubs):
+    payload = {
+        "clubs": [{
+            "id": club.id,
+            "name": club.name,
+            "description": club.description,
+            "location": club.location,
+            "member_count": club.member_count,
+            "rating": club.rating,
+            "image": club.image,
+            "features": club.features,
+            "is_active": club.is_active,
+            "created_at": club.created_at.isoformat() if club.created_at else None,
+            "updated_at": club.updated_at.isoformat() if club.updated_at else None
+        } for club in clubs],
+        "total": len(clubs)
+    }
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def type_adapter(clubs):
+    body = dump_list_json(ClubListAdapter, clubs)
+    return b'{"clubs":%s,"total":%d}' % (body, len(clubs))
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    clubs = make_clubs(rows)
+
+    for name, func in (("hand-built dicts", hand_built), ("TypeAdapter", type_adapter)):
+        best = min(timeit.repeat(lambda: func(clubs), number=1, repeat=repeats))
+        print(f"{name:>16}: {best * 1000:8.2f} ms for {rows} clubs "
+              f"({rows / best:,.0f} rows/s)")
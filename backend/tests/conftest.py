@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+# Settings are read on import, so point them at a scratch database first.
+# Never reuse DATABASE_URL from the environment: fixtures drop every table.
+_tmp_dir = tempfile.mkdtemp(prefix="morocco-clubs-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["DEBUG"] = "false"
+os.environ["UPLOAD_PATH"] = os.path.join(_tmp_dir, "uploads")
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created, empty tables."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app import cache
+from app.cache import SWRCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Only the cache's clock: the event loop keeps real time
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+class Loader:
+    """Returns queued results in order; blocks until ``gate`` is set if given."""
+
+    def __init__(self, *results, gate: threading.Event = None):
+        self.results = list(results)
+        self.gate = gate
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def make_cache():
+    return SWRCache(ttl=10, stale_while_revalidate=5, stale_if_error=60, error_backoff=30)
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+async def settle(swr: SWRCache):
+    await asyncio.gather(*swr._inflight.values(), return_exceptions=True)
+
+
+def test_concurrent_misses_share_one_load(clock):
+    async def scenario():
+        swr = make_cache()
+        gate = threading.Event()
+        loader = Loader("v1", gate=gate)
+        callers = [asyncio.ensure_future(swr.get("k", loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        assert await asyncio.gather(*callers) == ["v1"] * 5
+        assert loader.calls == 1
+
+    run(scenario())
+
+
+def test_stale_value_served_while_one_reload_runs(clock):
+    async def scenario():
+        swr = make_cache()
+        assert await swr.get("k", Loader("v1")) == "v1"
+
+        clock.now += 12
+        gate = threading.Event()
+        loader = Loader("v2", gate=gate)
+        # Neither caller waits on the blocked reload, and only one is started
+        assert await swr.get("k", loader) == "v1"
+        assert await swr.get("k", loader) == "v1"
+        gate.set()
+        await settle(swr)
+        assert loader.calls == 1
+        assert await swr.get("k", loader) == "v2"
+
+    run(scenario())
+
+
+def test_stale_if_error_backs_off_before_retrying(clock):
+    async def scenario():
+        swr = make_cache()
+        assert await swr.get("k", Loader("v1")) == "v1"
+
+        loader = Loader(RuntimeError("db down"), "v2")
+        clock.now += 20
+        assert await swr.get("k", loader) == "v1"
+        assert loader.calls == 1
+        # Within the backoff the stale value is served without a load
+        clock.now += 29
+        assert await swr.get("k", loader) == "v1"
+        assert loader.calls == 1
+        clock.now += 2
+        assert await swr.get("k", loader) == "v2"
+        assert loader.calls == 2
+
+    run(scenario())
+
+
+def test_errors_surface_once_too_stale(clock):
+    async def scenario():
+        swr = make_cache()
+        assert await swr.get("k", Loader("v1")) == "v1"
+
+        clock.now += 10 + 60
+        with pytest.raises(RuntimeError):
+            await swr.get("k", Loader(RuntimeError("db down")))
+
+    run(scenario())
+
+
+def test_load_started_before_put_does_not_replace_it(clock):
+    async def scenario():
+        swr = make_cache()
+        gate = threading.Event()
+        caller = asyncio.ensure_future(swr.get("k", Loader("loaded", gate=gate)))
+        await asyncio.sleep(0)
+        swr.put("k", "written")
+        gate.set()
+        # The waiting caller gets its load, but the cache keeps the newer value
+        assert await caller == "loaded"
+        assert await swr.get("k", Loader()) == "written"
+
+    run(scenario())
+
+
+def test_load_racing_invalidate_is_only_a_fallback(clock):
+    async def scenario():
+        swr = make_cache()
+        gate = threading.Event()
+        caller = asyncio.ensure_future(swr.get("k", Loader("old", gate=gate)))
+        await asyncio.sleep(0)
+        swr.invalidate()
+        gate.set()
+        assert await caller == "old"
+        # Not current, so it is reloaded at once, and kept if that fails
+        assert await swr.get("k", Loader("new")) == "new"
+        swr.invalidate()
+        assert await swr.get("k", Loader(RuntimeError("db down"))) == "new"
+
+    run(scenario())
@@ -0,0 +1,53 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.clubs.utils import clubs_cache
+from app.main import app
+from app.models import Club
+
+
+@pytest.fixture
+def client(db):
+    clubs_cache.clear()
+    yield TestClient(app)
+    clubs_cache.clear()
+
+
+def test_list_clubs_with_null_columns(db, client):
+    db.add(Club(name="Atlas Hikers", description="Treks", location="Atlas",
+                features=["Hiking"], social_media={"instagram": "@atlas"},
+                member_count=12, rating=4))
+    db.execute(insert(Club.__table__).values(
+        name="Bare Club", description="Nothing set", location="Rabat",
+        features=None, social_media=None, member_count=None, rating=None,
+        is_active=True, created_at=None, updated_at=None,
+    ))
+    db.commit()
+
+    response = client.get("/api/clubs")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    clubs = {club["name"]: club for club in body["clubs"]}
+    assert clubs["Atlas Hikers"]["features"] == ["Hiking"]
+    assert clubs["Atlas Hikers"]["created_at"] is not None
+
+    bare = clubs["Bare Club"]
+    assert bare["features"] == []
+    assert bare["social_media"] == {}
+    assert bare["member_count"] is None
+    assert bare["rating"] is None
+    assert bare["created_at"] is None
+    assert bare["updated_at"] is None
+
+
+def test_feature_filter(db, client):
+    db.add_all([
+        Club(name="Atlas", description="d", location="l", features=["Hiking", "Camping"]),
+        Club(name="Coast", description="d", location="l", features=["Surfing"]),
+        Club(name="Empty", description="d", location="l", features=None),
+    ])
+    db.commit()
+    body = client.get("/api/clubs", params={"features": "Hiking,Camping"}).json()
+    assert [club["name"] for club in body["clubs"]] == ["Atlas"]
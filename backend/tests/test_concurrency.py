@@ -0,0 +1,116 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import concurrency
+from app.concurrency import AdaptiveLimit
+from app.main import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(concurrency.time, "monotonic", clock)
+    return clock
+
+
+def _simulate(limit: AdaptiveLimit, clock: Clock, seconds: float, slowdown: float = 1.0,
+              rate: int = 400, in_flight: int = 3, seed: int = 7) -> None:
+    """Complete ``rate`` requests per second with ``in_flight`` outstanding.
+
+    70% hit a cached 1 ms route and 30% a 20 ms route, both ``slowdown``
+    times slower. ``in_flight=0`` keeps every slot busy.
+    """
+    rng = random.Random(seed)
+    for _ in range(int(seconds * rate)):
+        clock.now += 1.0 / rate
+        if rng.random() < 0.7:
+            route, latency = "/api/clubs", 0.001
+        else:
+            route, latency = "/api/events/nearby", 0.020
+        limit.in_flight = in_flight or int(limit.limit)
+        limit.release(latency * slowdown * rng.uniform(0.9, 1.3), 200, route)
+
+
+def test_mixed_route_latencies_are_not_congestion(clock):
+    limit = AdaptiveLimit("read", initial=64, min_limit=2, max_limit=256)
+    _simulate(limit, clock, seconds=30)
+    assert limit.limit == 64
+    assert set(limit.baselines) == {"/api/clubs", "/api/events/nearby"}
+
+
+def test_overload_cuts_once_per_window(clock):
+    limit = AdaptiveLimit("read", initial=64, min_limit=2, max_limit=256, window=0.1)
+    _simulate(limit, clock, seconds=5)
+    baselines = dict(limit.baselines)
+
+    _simulate(limit, clock, seconds=1, slowdown=5)
+    # Ten windows in that second, so at most ten cuts
+    assert 64 * 0.9 ** 11 < limit.limit < 64 * 0.9 ** 5
+
+    # Sustained overload does not become the baseline
+    _simulate(limit, clock, seconds=30, slowdown=5)
+    assert limit.baselines == baselines
+    assert limit.limit == 2
+
+
+def test_recovers_when_saturated_and_fast(clock):
+    limit = AdaptiveLimit("read", initial=8, min_limit=2, max_limit=256)
+    _simulate(limit, clock, seconds=5, in_flight=0)
+    assert limit.limit > 16
+
+
+def test_server_errors_count_as_congestion(clock):
+    limit = AdaptiveLimit("write", initial=16, min_limit=2, max_limit=64, window=0.1)
+    for _ in range(50):
+        clock.now += 0.01
+        limit.in_flight = 1
+        limit.release(0.005, 500, "/api/applications")
+    assert limit.limit == pytest.approx(16 * 0.9 ** 4, rel=0.01)
+
+
+def test_fast_client_errors_do_not_set_the_baseline(clock):
+    limit = AdaptiveLimit("auth", initial=8, min_limit=2, max_limit=64)
+    # A rate-limited attempt and a wrong password answer in well under a millisecond
+    clock.now += 0.01
+    limit.in_flight = 1
+    limit.release(0.0004, 429, "/api/auth/login")
+    limit.in_flight = 1
+    limit.release(0.0008, 401, "/api/auth/login")
+    for _ in range(300):
+        clock.now += 0.05
+        limit.in_flight = 2
+        limit.release(0.150, 200, "/api/auth/login")
+    assert limit.limit == 8
+    assert limit.baselines == {"/api/auth/login": 0.150}
+
+
+def test_baseline_rises_after_latency_grows(clock):
+    limit = AdaptiveLimit("read", initial=64, min_limit=2, max_limit=256, baseline_window=60)
+    for latency in (0.005, 0.020):
+        # Five minutes at each latency, e.g. a listing slowing as its table grows
+        for _ in range(3000):
+            clock.now += 0.1
+            limit.in_flight = 1
+            limit.release(latency, 200, "/api/applications")
+    assert limit.baselines["/api/applications"] == 0.020
+
+
+def test_middleware_keys_baselines_by_route(db, monkeypatch):
+    limit = AdaptiveLimit("read", initial=64, min_limit=2, max_limit=256)
+    monkeypatch.setitem(concurrency.limits, "read", limit)
+    client = TestClient(app)
+    client.get("/api/events/calendar.ics")
+    client.get("/api/content/join-config")
+    # 404s never set a baseline
+    client.get("/api/news/missing-slug")
+    assert set(limit.baselines) == {"/api/events/calendar.ics", "/api/content/join-config"}
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from app.admin.exports import stream_export
+from app.auth.utils import get_current_admin_user
+from app.main import app
+from app.models import ClubApplication, User
+
+ROWS = 100_000
+
+
+def _fill_applications(db, count: int, status: str = "submitted") -> None:
+    table = ClubApplication.__table__
+    for start in range(0, count, 10_000):
+        db.execute(insert(table), [
+            {
+                "applicant_name": f"Applicant {i}",
+                "email": f"applicant{i}@example.com",
+                "phone": "0600000000",
+                "interests": ["Hiking", "Camping"],
+                "motivation": "I would love to join the club " * 4,
+                "status": status,
+            }
+            for i in range(start, min(start + 10_000, count))
+        ])
+    db.commit()
+
+
+def _stream(fmt: str):
+    """Consume an export, returning (bytes produced, line count, peak traced memory)."""
+    statement = select(*ClubApplication.__table__.columns).order_by(ClubApplication.id)
+    size = lines = 0
+    tracemalloc.start()
+    try:
+        for chunk in stream_export(statement, fmt):
+            size += len(chunk)
+            lines += chunk.count("\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, lines, peak
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_streaming_memory_stays_flat(db, fmt):
+    _fill_applications(db, ROWS // 10)
+    _, _, small_peak = _stream(fmt)
+
+    _fill_applications(db, ROWS - ROWS // 10)
+    size, lines, peak = _stream(fmt)
+    assert lines == ROWS + (1 if fmt == "csv" else 0)
+    assert size > 20 * 1024 * 1024
+    # Only one batch is held at a time, so 10x the rows must not cost 10x the memory
+    assert peak < small_peak * 1.25, f"peak {peak} bytes for {ROWS} rows vs {small_peak} for {ROWS // 10}"
+    assert peak < size / 5
+
+
+@pytest.fixture
+def admin_client():
+    app.dependency_overrides[get_current_admin_user] = lambda: User(id="admin", is_admin=True)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_export_route_format_and_status(db, admin_client):
+    _fill_applications(db, 3)
+    _fill_applications(db, 2, status="approved")
+
+    response = admin_client.get("/api/admin/exports/applications", params={"format": "ndjson", "status": "approved"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["status"] for row in rows] == ["approved", "approved"]
+
+    response = admin_client.get("/api/admin/exports/applications")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(list(csv.reader(io.StringIO(response.text)))) == 6
+
+    assert admin_client.get("/api/admin/exports/applications", params={"format": "xml"}).status_code == 422
+    assert admin_client.get("/api/admin/exports/memberships", params={"status": "active"}).status_code == 200
+
+
+def test_csv_neutralises_formulas(db, admin_client):
+    db.execute(insert(ClubApplication.__table__).values(
+        applicant_name="=HYPERLINK(\"http://evil.example\",\"x\")", email="@SUM(A1)@example.com",
+        phone="+212600000000", interests=["-1+1"], motivation="\tcmd", status="submitted",
+    ))
+    db.commit()
+
+    response = admin_client.get("/api/admin/exports/applications")
+    header, row = list(csv.reader(io.StringIO(response.text)))
+    cells = dict(zip(header, row))
+    assert cells["applicant_name"] == "'=HYPERLINK(\"http://evil.example\",\"x\")"
+    assert cells["email"] == "'@SUM(A1)@example.com"
+    assert cells["phone"] == "'+212600000000"
+    assert cells["motivation"] == "'\tcmd"
+    assert cells["interests"] == '["-1+1"]'
+
+    # NDJSON is data, not a spreadsheet, and stays verbatim
+    response = admin_client.get("/api/admin/exports/applications", params={"format": "ndjson"})
+    assert json.loads(response.text)["applicant_name"].startswith("=HYPERLINK")
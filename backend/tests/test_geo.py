@@ -0,0 +1,99 @@
+import random
+
+import pytest
+from sqlalchemy import insert
+
+from app import geo
+from app.geo import find_nearby, geohash_encode, haversine_km
+from app.models import Club, ClubEvent
+
+COLUMNS = (Club.id, Club.latitude, Club.longitude)
+
+
+@pytest.fixture
+def clubs(db):
+    rng = random.Random(3)
+    points = []
+    # A dense city and sparse countryside
+    for i in range(3000):
+        if i < 2000:
+            lat, lon = rng.gauss(31.63, 0.05), rng.gauss(-8.0, 0.05)
+        else:
+            lat, lon = rng.uniform(29.0, 34.0), rng.uniform(-10.0, -5.0)
+        points.append({"name": f"Club {i}", "description": "d", "location": "l",
+                       "latitude": lat, "longitude": lon, "geohash": geohash_encode(lat, lon)})
+    db.execute(insert(Club.__table__), points)
+    db.commit()
+    return [(i + 1, p["latitude"], p["longitude"]) for i, p in enumerate(points)]
+
+
+@pytest.mark.parametrize("center", [(31.63, -8.0), (30.0, -9.5), (33.9, -5.2), (31.0, -14.0)])
+@pytest.mark.parametrize("radius, limit", [(5, 10), (50, 20), (400, 100), (1000, 5)])
+def test_matches_brute_force(db, clubs, center, radius, limit):
+    expected = sorted(
+        (haversine_km(*center, lat, lon), club_id)
+        for club_id, lat, lon in clubs
+        if haversine_km(*center, lat, lon) <= radius
+    )[:limit]
+    found = find_nearby(db, Club, COLUMNS, *center, radius, limit)
+    assert [row["id"] for row in found] == [club_id for _, club_id in expected]
+    assert [row["distance_km"] for row in found] == [round(d, 3) for d, _ in expected]
+
+
+def test_dense_areas_stop_at_a_small_ring(db, clubs, monkeypatch):
+    rings = []
+    within = geo._within
+
+    def traced(db, model, columns, latitude, longitude, radius_km, criteria):
+        rings.append(radius_km)
+        return within(db, model, columns, latitude, longitude, radius_km, criteria)
+
+    monkeypatch.setattr(geo, "_within", traced)
+    assert len(find_nearby(db, Club, COLUMNS, 31.63, -8.0, 1000, 20)) == 20
+    assert rings == [5.0]
+
+
+def test_create_tables_upgrades_existing_schema(tmp_path):
+    from sqlalchemy import Column, MetaData, Table, create_engine, inspect, select, text
+    from sqlalchemy.orm import Session
+
+    from app.database import Base, create_tables
+    from app.json_lists import backfill, contains_all
+    from app.models import ClubGallery, EventParticipant
+
+    dropped = {
+        Club: ("latitude", "longitude", "geohash"),
+        ClubEvent: ("latitude", "longitude", "geohash"),
+        EventParticipant: ("checked_in_at",),
+        ClubGallery: ("blob_digest",),
+    }
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    create_tables(fresh)
+    # Bare tables as they were before the new columns, indexes and tables
+    old = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name in ("media_blobs", "club_features"):
+            continue
+        skip = next((cols for model, cols in dropped.items() if model.__table__ is table), ())
+        Table(table.name, old, *(Column(c.name, c.type, primary_key=c.primary_key)
+                                  for c in table.columns if c.name not in skip))
+    bind = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    old.create_all(bind)
+    with bind.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO clubs (name, description, location, features, is_active, rating) "
+            "VALUES ('Atlas', 'd', 'l', '[\"Hiking\"]', 1, 5)"
+        ))
+
+    create_tables(bind)
+    backfill(bind)
+
+    upgraded, expected = inspect(bind), inspect(fresh)
+    for name in expected.get_table_names():
+        assert {c["name"] for c in upgraded.get_columns(name)} == {c["name"] for c in expected.get_columns(name)}
+        assert {i["name"] for i in upgraded.get_indexes(name)} == {i["name"] for i in expected.get_indexes(name)}
+    with Session(bind) as session:
+        assert session.scalars(select(Club.name).where(contains_all(Club, ["Hiking"], bind))).all() == ["Atlas"]
+        assert session.scalars(select(Club.geohash)).all() == [None]
+    # A second run finds nothing left to do
+    create_tables(bind)
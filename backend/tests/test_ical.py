@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app import database
+from app.events import ical
+from app.events.ical import ICalFeeds, _etag_matches, ical_feeds
+from app.main import app
+from app.models import Club, ClubEvent
+
+
+@pytest.fixture
+def client(db):
+    ical_feeds.clear()
+    yield TestClient(app)
+    ical_feeds.clear()
+
+
+def _club_with_events(db, name: str, count: int):
+    club = Club(name=name, description="d", location="l")
+    db.add(club)
+    db.flush()
+    soon = datetime.utcnow() + timedelta(days=7)
+    db.add_all([ClubEvent(club_id=club.id, title=f"{name} {i}", event_date=soon + timedelta(hours=i))
+                for i in range(count)])
+    db.commit()
+    return club.id
+
+
+def test_cached_feed_and_304_skip_the_database(db, client, monkeypatch):
+    club_id = _club_with_events(db, "Atlas", 2)
+    response = client.get(f"/api/clubs/{club_id}/events.ics")
+    assert response.status_code == 200
+    assert b"X-WR-CALNAME:Atlas" in response.content
+    etag = response.headers["etag"]
+
+    def no_session():
+        raise AssertionError("cached feed opened a database session")
+
+    monkeypatch.setattr(ical, "SessionLocal", no_session)
+    monkeypatch.setattr(database, "LazySession", no_session)
+    assert client.get(f"/api/clubs/{club_id}/events.ics").content == response.content
+    assert client.get(f"/api/clubs/{club_id}/events.ics",
+                      headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_unknown_and_deactivated_clubs(db, client):
+    assert client.get("/api/clubs/99/events.ics").status_code == 404
+    club_id = _club_with_events(db, "Atlas", 1)
+    assert client.get(f"/api/clubs/{club_id}/events.ics").status_code == 200
+    club = db.get(Club, club_id)
+    club.is_active = False
+    db.commit()
+    assert client.get(f"/api/clubs/{club_id}/events.ics").status_code == 404
+
+
+def test_if_none_match_compares_whole_tags():
+    assert _etag_matches('"abc"', '"abc"')
+    assert _etag_matches('"x", W/"abc" , "y"', '"abc"')
+    assert _etag_matches("*", '"abc"')
+    assert not _etag_matches('"abcd"', '"abc"')
+    assert not _etag_matches('"xabc"', '"abc"')
+    assert not _etag_matches('"a", "b"', '"abc"')
+    assert not _etag_matches("", '"abc"')
+
+
+def test_club_rebuilds_prune_fragments(db):
+    feeds = ICalFeeds(ttl=0, past_days=1)
+    atlas = _club_with_events(db, "Atlas", 3)
+    coast = _club_with_events(db, "Coast", 2)
+    feeds.get(atlas)
+    feeds.get(coast)
+    assert len(feeds._fragments) == 5
+
+    # Deleted by another worker, so no invalidation reached this process;
+    # only per-club feeds are ever rebuilt
+    db.execute(delete(ClubEvent).where(ClubEvent.club_id == atlas))
+    db.commit()
+    feeds.get(atlas)
+    assert sorted(fragment[0] for fragment in feeds._fragments.values()) == [coast, coast]
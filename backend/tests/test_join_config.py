@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.applications.validation import join_form_cache
+from app.auth.utils import get_current_admin_user
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture
+def client(db):
+    join_form_cache.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    join_form_cache.clear()
+
+
+def _as_admin():
+    app.dependency_overrides[get_current_admin_user] = lambda: User(id="admin", is_admin=True)
+
+
+def test_update_requires_an_admin(client):
+    response = client.put("/api/content/join-config", json={"page_title": "Join"})
+    assert response.status_code in (401, 403)
+
+
+def test_update_is_served_and_enforced(client):
+    _as_admin()
+    response = client.put("/api/content/join-config", json={
+        "page_title": "Join the trek",
+        "validation": {"nameMinLength": 5, "phoneMinLength": 10, "motivationMinLength": 10},
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["page_title"] == "Join the trek"
+    assert client.get("/api/content/join-config").json()["page_title"] == "Join the trek"
+
+    application = {"applicant_name": "Ali", "email": "ali@example.com", "phone": "0600000000",
+                   "interests": ["Hiking"], "motivation": "I love the mountains"}
+    response = client.post("/api/applications", json=application)
+    assert response.status_code == 422
+    assert [e["field"] for e in response.json()["detail"]] == ["applicant_name"]
+    response = client.post("/api/applications", json={**application, "applicant_name": "Ali Idrissi"})
+    assert response.status_code == 201
+
+
+def test_invalid_rules_are_rejected(client):
+    _as_admin()
+    response = client.put("/api/content/join-config", json={"validation": {"phonePattern": "("}})
+    assert response.status_code == 422
+    assert client.get("/api/content/join-config").json()["validation"].get("phonePattern") is None
@@ -0,0 +1,47 @@
+from sqlalchemy import create_mock_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.database import Base, schema_tables
+from app.json_lists import SIDE_TABLES, contains_all
+from app.models import Club, ClubApplication, NewsArticle, club_features
+
+SIDE_TABLE_NAMES = {table.name for _, table, _ in SIDE_TABLES.values()}
+
+
+def _ddl(url: str):
+    statements = []
+    mock = create_mock_engine(url, lambda sql, *a, **kw: statements.append(str(sql.compile(dialect=mock.dialect))))
+    Base.metadata.create_all(mock, tables=schema_tables(mock.dialect), checkfirst=False)
+    return "\n".join(statements)
+
+
+def test_side_tables_are_not_created_on_postgres():
+    names = {table.name for table in schema_tables(postgresql.dialect())}
+    assert "clubs" in names
+    assert not SIDE_TABLE_NAMES & names
+
+
+def test_side_tables_are_created_elsewhere():
+    assert SIDE_TABLE_NAMES <= {table.name for table in schema_tables(sqlite.dialect())}
+    ddl = _ddl("sqlite://")
+    assert "CREATE INDEX ix_club_features_value" in ddl
+
+
+def test_side_tables_track_writes_on_sqlite(db):
+    club = Club(name="Atlas", description="d", location="l", features=["Hiking", "Camping"])
+    db.add(club)
+    db.commit()
+    club.features = ["Surfing"]
+    db.commit()
+    assert db.execute(select(club_features.c.value)).scalars().all() == ["Surfing"]
+
+
+def test_postgres_containment_uses_jsonb_operator():
+    class Bind:
+        dialect = postgresql.dialect()
+
+    for model in (Club, NewsArticle, ClubApplication):
+        sql = str(select(model.id).where(contains_all(model, ["Hiking", "Camping"], Bind()))
+                  .compile(dialect=postgresql.dialect()))
+        assert "@>" in sql
+        assert "LIKE" not in sql
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime
+
+import fakeredis
+from fastapi.testclient import TestClient
+
+from app.auth.utils import get_current_admin_user
+from app.events import live
+from app.events.live import EventBroadcaster, Subscription
+from app.main import app
+from app.models import Club, User
+
+
+def payload(event_id: int, current: int, status: str = "upcoming"):
+    return {"id": event_id, "club_id": 1, "current_participants": current,
+            "max_participants": 10, "seats_left": 10 - current, "status": status}
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_slow_subscriber_keeps_latest_state_per_event():
+    async def scenario():
+        subscription = Subscription(None, max_pending=10)
+        # Many batches arrive before the client reads anything
+        for current in range(500):
+            subscription.offer([payload(1, current % 10)])
+            if current % 7 == 0:
+                subscription.offer([payload(2, current % 10)])
+        subscription.offer([payload(3, 4, status="cancelled")])
+        batch = await subscription.get()
+        assert {p["id"]: p["current_participants"] for p in batch} == {1: 9, 2: 7, 3: 4}
+        assert [p["status"] for p in batch if p["id"] == 3] == ["cancelled"]
+
+    run(scenario())
+
+
+def test_too_many_pending_events_asks_for_resync():
+    async def scenario():
+        subscription = Subscription(None, max_pending=3)
+        subscription.offer([payload(i, 1) for i in range(5)])
+        assert await subscription.get() is None
+        # Later updates are delivered normally again
+        subscription.offer([payload(7, 2)])
+        assert await subscription.get() == [payload(7, 2)]
+
+    run(scenario())
+
+
+def test_subscription_filters_event_ids():
+    async def scenario():
+        subscription = Subscription(frozenset({2}), max_pending=10)
+        subscription.offer([payload(1, 1)])
+        assert not subscription._ready.is_set()
+        subscription.offer([payload(1, 2), payload(2, 3)])
+        assert await subscription.get() == [payload(2, 3)]
+
+    run(scenario())
+
+
+def test_local_broadcast_coalesces_per_interval():
+    async def scenario():
+        broadcaster = EventBroadcaster(interval=0.01)
+        await broadcaster.start()
+        try:
+            async with broadcaster.subscribe() as subscription:
+                for current in range(5):
+                    broadcaster.notify(payload(1, current))
+                assert await subscription.get() == [payload(1, 4)]
+        finally:
+            await broadcaster.stop()
+
+    run(scenario())
+
+
+def test_redis_relays_between_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        workers = [
+            EventBroadcaster(interval=0.01, redis=fakeredis.FakeAsyncRedis(server=server))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            await worker.start()
+        try:
+            async with workers[0].subscribe() as first, workers[1].subscribe() as second:
+                # Let both listeners subscribe to the channel
+                await asyncio.sleep(0.1)
+                workers[0].notify(payload(1, 3))
+                assert await second.get() == [payload(1, 3)]
+                # The publishing worker gets its own message back from Redis
+                assert await first.get() == [payload(1, 3)]
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+    run(scenario())
+
+
+def test_redis_outage_delivers_locally():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        broadcaster = EventBroadcaster(interval=0.01, redis=fakeredis.FakeAsyncRedis(server=server))
+        await broadcaster.start()
+        try:
+            async with broadcaster.subscribe() as subscription:
+                server.connected = False
+                broadcaster.notify(payload(1, 5))
+                assert await subscription.get() == [payload(1, 5)]
+        finally:
+            server.connected = True
+            await broadcaster.stop()
+
+    run(scenario())
+
+
+def test_bulk_created_events_are_published(db, monkeypatch):
+    db.add(Club(name="Atlas", description="d", location="l"))
+    db.commit()
+    published = []
+    monkeypatch.setattr(live.broadcaster, "notify", published.append)
+    app.dependency_overrides[get_current_admin_user] = lambda: User(id="admin", is_admin=True)
+    try:
+        response = TestClient(app).post("/api/admin/events/bulk", json={"items": [
+            {"club_id": 1, "title": "Trek", "event_date": datetime(2030, 1, 1).isoformat(),
+             "max_participants": 12},
+            {"club_id": 1, "title": "Camp", "event_date": datetime(2030, 2, 1).isoformat()},
+        ]})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 201
+    ids = [item["id"] for item in response.json()["results"]]
+    assert sorted(p["id"] for p in published) == sorted(ids)
+    assert {p["id"]: p["seats_left"] for p in published}[ids[0]] == 12
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.auth.utils import get_current_user
+from app.config import settings
+from app.main import app
+from app.models import Club, ClubGallery, MediaBlob, User
+
+
+@pytest.fixture
+def client(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_path", str(tmp_path))
+    app.dependency_overrides[get_current_user] = lambda: User(id="admin", is_admin=True)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _blob_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), root)
+        for path, _, names in os.walk(os.path.join(root, "blobs"))
+        for name in names
+    )
+
+
+def test_reupload_under_another_type_reuses_the_stored_blob(db, client, tmp_path):
+    db.add(Club(name="Atlas", description="d", location="l"))
+    db.commit()
+    data = b"\x89PNG\r\n\x1a\n" + os.urandom(512)
+
+    first = client.post("/api/media/clubs/1/gallery", files={"file": ("a.png", data, "image/png")})
+    second = client.post("/api/media/clubs/1/gallery", files={"file": ("a.jpg", data, "image/jpeg")})
+    assert first.status_code == second.status_code == 201
+    assert first.json()["image_url"].endswith(".png")
+    assert second.json()["image_url"] == first.json()["image_url"]
+
+    blob = db.execute(select(MediaBlob)).scalar_one()
+    assert (blob.extension, blob.ref_count) == (".png", 2)
+    assert _blob_files(str(tmp_path)) == [first.json()["image_url"][len("/uploads/"):]]
+    assert os.listdir(tmp_path / "tmp") == []
+
+    # Reuse by digest points at the same file too
+    third = client.post("/api/media/clubs/1/gallery", data={"digest": blob.digest})
+    assert third.json()["image_url"] == first.json()["image_url"]
+    assert {g.image_url for g in db.execute(select(ClubGallery)).scalars()} == {first.json()["image_url"]}
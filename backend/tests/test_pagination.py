@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert
+
+from app.auth.utils import get_current_admin_user
+from app.main import app
+from app.models import ClubApplication, NewsArticle, User
+
+
+@pytest.fixture
+def admin_client():
+    app.dependency_overrides[get_current_admin_user] = lambda: User(id="admin", is_admin=True)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _pages(client, url: str, key: str, limit: int = 2):
+    ids, cursor = [], None
+    # A cursor that does not advance would otherwise page forever
+    for _ in range(20):
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids.extend(item["id"] for item in body[key])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+    pytest.fail(f"cursor did not reach the end, saw {ids[:20]}")
+
+
+def _application(**values):
+    return insert(ClubApplication.__table__).values(
+        applicant_name="Applicant", email="a@example.com", phone="0600000000",
+        interests=[], motivation="m", status="submitted", **values,
+    )
+
+
+def test_applications_page_through_null_and_same_second_rows(db, admin_client):
+    # func.now() on SQLite stores no fractional seconds, unlike bound datetimes
+    for _ in range(3):
+        db.execute(_application(created_at=func.now()))
+    db.execute(_application(created_at=datetime(2020, 1, 1, 12, 0, 0, 500000)))
+    for _ in range(3):
+        db.execute(_application(created_at=None))
+    db.commit()
+
+    ids = _pages(admin_client, "/api/applications", "applications")
+    # Newest first, ties by id descending, NULL created_at last
+    assert ids == [3, 2, 1, 4, 7, 6, 5]
+
+
+def test_news_pages_through_same_second_rows(db):
+    for i in range(5):
+        db.execute(insert(NewsArticle.__table__).values(
+            title=f"Article {i}", slug=f"article-{i}", content="c",
+            is_published=True, published_at=func.now(),
+        ))
+    db.execute(insert(NewsArticle.__table__).values(
+        title="Draft", slug="draft", content="c", is_published=True, published_at=None,
+    ))
+    db.commit()
+
+    assert _pages(TestClient(app), "/api/news", "articles") == [5, 4, 3, 2, 1]
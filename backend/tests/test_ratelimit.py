@@ -0,0 +1,147 @@
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app import ratelimit
+from app.ratelimit import MemoryBackend, RateLimit, RateLimiter, RedisBackend, parse_rate
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def redis_limiter(server: fakeredis.FakeServer) -> RateLimiter:
+    limiter = RateLimiter()
+    limiter.redis = RedisBackend(client=fakeredis.FakeAsyncRedis(server=server))
+    return limiter
+
+
+def test_parse_rate():
+    assert parse_rate("5/minute") == (5.0, 5 / 60)
+    assert parse_rate("10 / seconds") == (10.0, 10.0)
+    for bad in ("5", "0/minute", "5/fortnight", "x/hour"):
+        with pytest.raises(ValueError):
+            parse_rate(bad)
+
+
+def test_memory_burst_then_reject():
+    backend = MemoryBackend()
+    results = [run(backend.hit("k", capacity=3, rate=1)) for _ in range(4)]
+    assert results[:3] == [0.0, 0.0, 0.0]
+    assert results[3] == pytest.approx(1.0, abs=0.05)
+
+
+def test_memory_refill(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    backend = MemoryBackend()
+    for _ in range(2):
+        assert run(backend.hit("k", capacity=2, rate=0.5)) == 0
+    assert run(backend.hit("k", capacity=2, rate=0.5)) == pytest.approx(2.0)
+
+    now[0] += 2.0
+    assert run(backend.hit("k", capacity=2, rate=0.5)) == 0
+    assert run(backend.hit("k", capacity=2, rate=0.5)) > 0
+
+    # Refill never exceeds the bucket capacity
+    now[0] += 3600
+    assert [run(backend.hit("k", capacity=2, rate=0.5)) == 0 for _ in range(3)] == [True, True, False]
+
+
+def test_memory_evicts_least_recently_used():
+    backend = MemoryBackend(max_keys=2)
+    run(backend.hit("a", capacity=1, rate=0.001))
+    run(backend.hit("b", capacity=1, rate=0.001))
+    run(backend.hit("c", capacity=1, rate=0.001))
+    assert list(backend._buckets) == ["b", "c"]
+    # A dropped bucket starts full again
+    assert run(backend.hit("a", capacity=1, rate=0.001)) == 0
+
+
+def test_redis_script_burst_and_refill():
+    async def scenario():
+        limiter = redis_limiter(fakeredis.FakeServer())
+        results = [await limiter.hit("k", "3/second") for _ in range(4)]
+        assert results[:3] == [0.0, 0.0, 0.0]
+        assert 0 < results[3] <= 1 / 3
+        # Nothing went to the local buckets
+        assert not limiter.memory._buckets
+
+        await asyncio.sleep(0.4)
+        assert await limiter.hit("k", "3/second") == 0
+
+    run(scenario())
+
+
+def test_redis_buckets_are_shared_between_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = redis_limiter(server), redis_limiter(server)
+        assert await first.hit("k", "2/minute") == 0
+        assert await second.hit("k", "2/minute") == 0
+        assert await first.hit("k", "2/minute") > 0
+        assert await second.hit("k", "2/minute") > 0
+
+    run(scenario())
+
+
+def test_redis_outage_falls_back_to_local_buckets():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        limiter = redis_limiter(server)
+        server.connected = False
+        assert await limiter.hit("k", "1/minute") == 0
+        assert await limiter.hit("k", "1/minute") > 0
+        assert "k" in limiter.memory._buckets
+
+        # Once Redis is back its own bucket is used again
+        server.connected = True
+        assert await limiter.hit("k", "1/minute") == 0
+
+    run(scenario())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(ratelimit, "limiter", RateLimiter())
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(RateLimit("test", "2/minute"))])
+    async def limited():
+        return {"ok": True}
+
+    @app.get("/shared", dependencies=[Depends(RateLimit("shared", "1/minute", key="route"))])
+    async def shared():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_429_with_retry_after(client):
+    assert [client.get("/limited").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests, please try again later"}
+    assert 1 <= int(response.headers["retry-after"]) <= 30
+
+
+def test_ip_buckets_are_per_client(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_trust_forwarded", True)
+    for _ in range(2):
+        client.get("/limited", headers={"X-Forwarded-For": "10.0.0.1"})
+    assert client.get("/limited", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+    assert client.get("/limited", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
+
+
+def test_route_key_shares_one_bucket(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_trust_forwarded", True)
+    assert client.get("/shared", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.get("/shared", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 429
+
+
+def test_disabled_limits_always_pass(client, monkeypatch):
+    monkeypatch.setattr(ratelimit.settings, "rate_limit_enabled", False)
+    assert {client.get("/limited").status_code for _ in range(5)} == {200}
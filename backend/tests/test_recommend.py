@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select, update
+
+from app.clubs.recommend import ClubRecommender, recommender
+from app.main import app
+from app.models import Club
+
+
+def _clubs(db, *features_by_name):
+    clubs = [Club(name=name, description="d", location="l", features=features, rating=rating)
+             for name, features, rating in features_by_name]
+    db.add_all(clubs)
+    db.commit()
+    return [club.id for club in clubs]
+
+
+def test_sync_drops_clubs_deleted_elsewhere(db):
+    atlas, coast = _clubs(db, ("Atlas", ["Hiking"], 5), ("Coast", ["Hiking"], 3))
+    index = ClubRecommender()
+    index.load(db)
+    assert [club_id for club_id, _ in index.recommend(["hiking"])] == [atlas, coast]
+
+    # Another worker hard-deletes a club; no mapper event reaches this index
+    db.execute(delete(Club).where(Club.id == atlas))
+    db.commit()
+    index.sync(db, interval=0)
+    assert [club_id for club_id, _ in index.recommend(["hiking"])] == [coast]
+
+
+def test_sync_overlap_catches_late_commits(db):
+    index = ClubRecommender(sync_overlap=30)
+    index.load(db)
+    (club_id,) = _clubs(db, ("Atlas", ["Hiking"], 5))
+    # A transaction that started before the watermark commits after it
+    db.execute(update(Club).values(updated_at=index.synced_at - timedelta(seconds=10)))
+    db.commit()
+    index.sync(db, interval=0)
+    assert [c for c, _ in index.recommend(["hiking"])] == [club_id]
+
+
+def test_sync_same_second_update_on_sqlite(db):
+    index = ClubRecommender(sync_overlap=0)
+    index.load(db)
+    # func.now() is stored without fractional seconds on SQLite, so the row
+    # sorts before a bound watermark from the same second when compared as text
+    (club_id,) = _clubs(db, ("Atlas", ["Hiking"], 5))
+    db.execute(update(Club).values(updated_at=func.now()))
+    db.commit()
+    index.synced_at = db.execute(select(Club.updated_at)).scalar()
+    index.sync(db, interval=0)
+    assert [c for c, _ in index.recommend(["hiking"])] == [club_id]
+
+
+def test_route_fills_page_past_stale_entries(db, monkeypatch):
+    ids = _clubs(db, ("A", ["Hiking"], 5), ("B", ["Hiking"], 4),
+                 ("C", ["Hiking"], 3), ("D", ["Hiking"], 2))
+    monkeypatch.setattr(recommender, "synced_at", None)
+    client = TestClient(app)
+    assert client.get("/api/clubs/recommended", params={"interests": "hiking", "limit": 2}).status_code == 200
+
+    # Deleted and deactivated elsewhere, before the next periodic sync
+    db.execute(delete(Club).where(Club.id == ids[0]))
+    db.execute(update(Club).where(Club.id == ids[1]).values(is_active=False))
+    db.commit()
+    body = client.get("/api/clubs/recommended", params={"interests": "hiking", "limit": 2}).json()
+    assert [club["id"] for club in body["clubs"]] == ids[2:]
+    # Stale entries are dropped from the index as they are found
+    assert {c for c, _ in recommender.recommend(["hiking"], 10)} == set(ids[2:])
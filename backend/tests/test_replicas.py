@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import column, create_engine, select, table, text
+
+from app import database
+from app.database import ReplicaSet, SessionLocal, SessionReleaseMiddleware, get_db
+
+MARKER = select(column("name")).select_from(table("marker"))
+
+
+def _marked_url(path, name: str) -> str:
+    url = f"sqlite:///{path}"
+    with create_engine(url).begin() as conn:
+        conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    return url
+
+
+@pytest.fixture
+def replica_set(tmp_path, monkeypatch):
+    # Two local databases standing in for read replicas, each tagged with its name
+    replica_set = ReplicaSet(
+        [_marked_url(tmp_path / "r1.db", "r1"), _marked_url(tmp_path / "r2.db", "r2")],
+        max_lag=5.0,
+        check_interval=60.0,
+    )
+    monkeypatch.setattr(database, "replicas", replica_set)
+    with database.engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS marker"))
+        conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES ('primary')"))
+    return replica_set
+
+
+def _reads(session, count: int = 5):
+    return [session.execute(MARKER).scalar() for _ in range(count)]
+
+
+def test_session_keeps_one_replica(replica_set):
+    seen = []
+    for _ in range(4):
+        with SessionLocal() as session:
+            reads = _reads(session)
+            assert len(set(reads)) == 1
+            seen.append(reads[0])
+    # Sessions themselves are spread round-robin
+    assert seen == ["r1", "r2", "r1", "r2"]
+
+
+def test_writes_pin_the_session_to_the_primary(replica_set):
+    with SessionLocal() as session:
+        assert _reads(session, 1) == ["r1"]
+        session.execute(text("UPDATE marker SET name = 'primary'"))
+        assert _reads(session, 2) == ["primary", "primary"]
+
+
+def test_use_primary_flag(replica_set):
+    with SessionLocal() as session:
+        session.info["use_primary"] = True
+        assert _reads(session, 2) == ["primary", "primary"]
+
+
+def test_pick_never_probes(replica_set, monkeypatch):
+    probes = []
+    monkeypatch.setattr(replica_set, "lag", lambda replica: probes.append(replica) or 0.0)
+    for _ in range(10):
+        replica_set.pick()
+    assert probes == []
+
+
+def test_unhealthy_replicas_are_skipped(replica_set, monkeypatch):
+    r1, r2 = replica_set.engines
+
+    def lag(replica):
+        if replica is r1:
+            raise ConnectionError("down")
+        return 0.0
+
+    monkeypatch.setattr(replica_set, "lag", lag)
+    replica_set.check_all()
+    assert [replica_set.pick() for _ in range(3)] == [r2, r2, r2]
+    assert [s["healthy"] for s in replica_set.status()] == [False, True]
+    with SessionLocal() as session:
+        assert _reads(session, 1) == ["r2"]
+
+    # Lagging too far behind counts as unhealthy as well
+    monkeypatch.setattr(replica_set, "lag", lambda replica: 60.0)
+    replica_set.check_all()
+    assert replica_set.pick() is None
+    with SessionLocal() as session:
+        assert _reads(session, 1) == ["primary"]
+
+
+def test_background_checks(replica_set, monkeypatch):
+    probes = []
+    monkeypatch.setattr(replica_set, "lag", lambda replica: probes.append(replica) or 0.0)
+    replica_set.check_interval = 0.01
+
+    async def scenario():
+        await replica_set.start()
+        # The first round runs before start() returns
+        assert len(probes) == 2
+        await asyncio.sleep(0.1)
+        await replica_set.stop()
+
+    asyncio.run(scenario())
+    assert len(probes) > 2
+    stopped_at = len(probes)
+    asyncio.run(asyncio.sleep(0.05))
+    assert len(probes) == stopped_at
+
+
+def test_write_requests_read_from_the_primary(replica_set):
+    probe = FastAPI()
+    probe.add_middleware(SessionReleaseMiddleware)
+
+    @probe.api_route("/marker", methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"])
+    async def marker(db=Depends(get_db)):
+        return {"name": db.execute(MARKER).scalar()}
+
+    client = TestClient(probe)
+    for method in ("POST", "PUT", "PATCH", "DELETE"):
+        assert client.request(method, "/marker").json() == {"name": "primary"}
+    assert client.get("/marker").json()["name"] in ("r1", "r2")